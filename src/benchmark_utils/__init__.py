@@ -1,4 +1,30 @@
-from .benchmark import Benchmark, BenchmarkIter
-from .version import __version__
+"""Utils for benchmark. Names imported lazily, on first use, so `import benchmark_utils` is fast."""
 
-__all__ = ["Benchmark", "BenchmarkIter", "__version__"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .benchmark import Benchmark, BenchmarkIter
+    from .stats import BenchmarkResult
+    from .version import __version__
+
+_LAZY = {
+    "Benchmark": ".benchmark",
+    "BenchmarkIter": ".benchmark",
+    "BenchmarkResult": ".stats",
+    "__version__": ".version",
+}
+
+__all__ = ["Benchmark", "BenchmarkIter", "BenchmarkResult", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value  # next access w/o __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY))
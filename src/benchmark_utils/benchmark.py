@@ -2,41 +2,272 @@
 
 from __future__ import annotations
 
+import gc
+import inspect
+import os
+import random
+from array import array
 from collections import defaultdict
+from contextlib import contextmanager, nullcontext
 from functools import partial
-from multiprocessing import Pool, cpu_count
-from timeit import timeit
-from typing import Any, Callable, Dict, List, Optional, Union
-
-from rich import print as rprint
-from rich.progress import (
-    BarColumn,
-    Progress,
-    TaskProgressColumn,
-    TextColumn,
-    TimeRemainingColumn,
+from itertools import islice
+from pathlib import Path
+from threading import get_native_id
+from time import perf_counter, perf_counter_ns, thread_time_ns
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
 )
 
+from .complexity import ParamReport, ParamRow, fit_complexity
+from .console import escape, rprint
+from .cpu import CPU_COLUMNS, CpuUsage, cpu_usage, rusage
+from .errors import MAX_EXCEPTION_SAMPLES, ExceptionLog, exception_info
+from .executors import BACKENDS, CHUNKSIZE_BACKENDS, AnyPool, create_pool, interpreters_available, is_free_threaded
+from .history import ResultStore, compare_results, host_fingerprint
+from .isolation import run_isolated
+from .memory import (
+    MEMORY_COLUMNS,
+    MemoryResult,
+    format_bytes,
+    memory_per_item,
+    processes_max_rss,
+    trace_memory,
+)
+from .profiling import PROFILERS, profile_func, profile_path, top_functions
+from .progress import PROGRESS_MODES, ProgressUpdater, create_progress
+from .scaling import ScalingReport, default_workers, scaling_report
+from .shared import SHARED_KINDS, SharedItems, SharedRef, shared_item
+from .sources import AnySource, ItemSource
+from .stats import STAT_COLUMNS, BenchmarkResult
+from .trace import TraceRecorder
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+    from timeit import Timer
+
+    from rich.progress import Progress, TaskID
+
 AnyFunc = Callable[[Union[Any, None]], Union[Any, None]]
 
+ORDERS = ("sequential", "interleaved", "random")
+
+
+TIME_UNITS = {"nsec": 1e-9, "usec": 1e-6, "msec": 1e-3, "sec": 1.0}
+
+
+def format_time(seconds: float, precision: int = 3) -> str:
+    """Return time as string with suitable unit, like timeit cli"""
+    scales = sorted(((scale, unit) for unit, scale in TIME_UNITS.items()), reverse=True)
+    for scale, unit in scales:
+        if seconds >= scale:
+            break
+    return f"{seconds / scale:.{precision}g} {unit}"
+
+
+class GcCounter:
+    """Count garbage collections per generation, using gc.callbacks"""
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(gc.get_count())
+
+    def _callback(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self.counts[info["generation"]] += 1
+
+    def __enter__(self) -> GcCounter:
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        gc.callbacks.remove(self._callback)
+
+
+def make_timer(func: AnyFunc, disable_gc: bool = True) -> Timer:
+    """Return timeit.Timer for func, gc enabled while timing if not disable_gc"""
+    from timeit import Timer
+
+    return Timer(func, setup="pass" if disable_gc else gc.enable)  # type: ignore
+
+
+def time_func(func: AnyFunc, number: int = 1, disable_gc: bool = True) -> float:
+    """Return time for number calls of func.
+    As timeit, gc disabled while timing, use disable_gc=False to keep it enabled."""
+    return make_timer(func, disable_gc).timeit(number=number)
+
+
+def calibrate(func: AnyFunc, target_time: float = 0.2, disable_gc: bool = True) -> int:
+    """Return number of loops, so one sample takes at least target_time, like timeit.Timer.autorange"""
+    i = 1
+    while True:
+        for j in 1, 2, 5:
+            number = i * j
+            if time_func(func, number=number, disable_gc=disable_gc) >= target_time:
+                return number
+        i *= 10
+
+
+class Sample(NamedTuple):
+    """One timed run: time per call, number of loops, gc collections per generation, resources used"""
+
+    time: float
+    loops: int
+    gc_collections: Tuple[int, ...]
+    cpu: Optional[CpuUsage] = None
+
+
+def iter_samples(
+    func: AnyFunc,
+    num_repeats: int,
+    number: int = 1,
+    warmup: int = 0,
+    disable_gc: bool = True,
+    children_cpu: Optional[Callable[[], float]] = None,
+    stop: Optional[Callable[[BenchmarkResult], bool]] = None,
+    warmup_context: Optional[ContextManager[Any]] = None,
+) -> Iterator[Sample]:
+    """Yield num_repeats samples for func, after `warmup` runs, inside `warmup_context` if given.
+    Number of garbage collections per generation and resources used (rusage) recorded for every run,
+    `children_cpu` - cumulative cpu time of worker processes, not counted by rusage.
+    `stop` - called with samples so far after every sample, stop early if returns True.
+    Timer made once, outside of rusage window, cpu utilization - to wall time of same window."""
+    timer = make_timer(func, disable_gc)
+    with warmup_context or nullcontext():
+        for _ in range(warmup):
+            timer.timeit(number=number)
+    times = BenchmarkResult()
+    with GcCounter() as gc_counter:
+        for _ in range(num_repeats):
+            gc_before = list(gc_counter.counts)
+            children_before = children_cpu() if children_cpu else 0.0
+            start = perf_counter()
+            rusage_before = rusage()
+            run_time = timer.timeit(number=number)
+            rusage_after = rusage()
+            wall = perf_counter() - start
+            children = children_cpu() - children_before if children_cpu else 0.0
+            gc_collections = tuple(a - b for a, b in zip(gc_counter.counts, gc_before))
+            cpu = cpu_usage(rusage_before, rusage_after, wall, children)
+            yield Sample(run_time / number, number, gc_collections, cpu)
+            if stop is not None:
+                times.append(run_time / number)
+                if stop(times):
+                    return
+
+
+class SampleCollector:
+    """Collect samples for one function to results, show progress at own task"""
+
+    text_color = "[blue]"
+
+    def __init__(self, name: str, num_repeats: int, progress_bar: Progress):
+        self.name = name
+        self.num_repeats = num_repeats
+        self.progress_bar = progress_bar
+        self.result = BenchmarkResult()
+        self.task = progress_bar.add_task(f"{self.text_color}{name}: run 1/{num_repeats}", total=num_repeats)
+
+    def add(self, sample: Sample) -> None:
+        result = self.result
+        result.append(sample.time)
+        result.loops = sample.loops
+        result.gc_collections.append(sample.gc_collections)
+        if sample.cpu is not None:
+            result.cpu.append(sample.cpu)
+        self.progress_bar.update(self.task, advance=1)
+        if len(result) < self.num_repeats:
+            self.progress_bar.tasks[
+                self.task
+            ].description = f"{self.text_color}{self.name}: run {len(result) + 1}/{self.num_repeats}"
+
+    def finish(self) -> BenchmarkResult:
+        """Return result, progress task shows mean time"""
+        result = self.result
+        if len(result) < self.num_repeats:  # stopped early
+            self.progress_bar.update(self.task, total=len(result))
+        run_time_avg = result.mean
+        if result.loops == 1:
+            description = f"{self.name}: {run_time_avg:0.2f} sec/run."
+        else:
+            description = f"{self.name}: {format_time(run_time_avg)}/call, {result.loops} loops."
+        self.progress_bar.tasks[self.task].description = f"{self.text_color}{description}"
+        return result
+
+
+def collect_samples(
+    name: str,
+    samples: Iterable[Sample],
+    num_repeats: int,
+    progress_bar: Progress,
+) -> BenchmarkResult:
+    """Collect samples to results, show progress"""
+    collector = SampleCollector(name, num_repeats, progress_bar)
+    for sample in samples:
+        collector.add(sample)
+    return collector.finish()
+
+
+def interleave(
+    sources: Dict[str, Iterator[Sample]],
+    rng: Optional[random.Random] = None,
+) -> Iterator[Tuple[str, Sample]]:
+    """Yield (name, sample) round-robin over sources, one sample from every source per round,
+    order at every round shuffled by `rng` if given (randomized blocks). Exhausted sources dropped."""
+    active = list(sources)
+    while active:
+        names = list(active)
+        if rng is not None:
+            rng.shuffle(names)
+        for name in names:
+            sample = next(sources[name], None)
+            if sample is None:
+                active.remove(name)
+            else:
+                yield name, sample
+
 
 def benchmark(
     name: str,
     func: AnyFunc,
     num_repeats: int,
     progress_bar: Progress,
-) -> List[float]:
-    """Return list of run times for func, num_repeats times"""
-    run_times: List[float] = []
-    text_color = "[blue]"
-    task = progress_bar.add_task(f"{text_color}{name}", total=num_repeats)
-    for i in range(num_repeats):
-        progress_bar.tasks[task].description = f"{text_color}{name}: run {i + 1}/{num_repeats}"
-        run_times.append(timeit(func, number=1))  # type: ignore
-        progress_bar.update(task, advance=1)
-    run_time_avg = sum(run_times) / len(run_times)
-    progress_bar.tasks[task].description = f"{text_color}{name}: {run_time_avg:0.2f} sec/run."
-    return run_times
+    number: int = 1,
+    warmup: int = 0,
+    disable_gc: bool = True,
+    children_cpu: Optional[Callable[[], float]] = None,
+    stop: Optional[Callable[[BenchmarkResult], bool]] = None,
+    warmup_context: Optional[ContextManager[Any]] = None,
+) -> BenchmarkResult:
+    """Return results for func, num_repeats times, or less if `stop` returns True.
+    If number > 1, func called number times per run, time returned per call.
+    First `warmup` runs (inside `warmup_context` if given) are not included in results."""
+    return collect_samples(
+        name,
+        iter_samples(
+            func,
+            num_repeats,
+            number=number,
+            warmup=warmup,
+            disable_gc=disable_gc,
+            children_cpu=children_cpu,
+            stop=stop,
+            warmup_context=warmup_context,
+        ),
+        num_repeats,
+        progress_bar,
+    )
 
 
 def get_func_name(func: AnyFunc) -> str:
@@ -48,11 +279,33 @@ def get_func_name(func: AnyFunc) -> str:
 
 
 class Benchmark:
-    """Benchmark functions, num_repeats times"""
+    """Benchmark functions, num_repeats times.
+    Use `autorange=True` for fast functions - number of loops per run calibrated
+    for every function, so run takes at least `target_time`, results are per call.
+    Coroutine functions (async def) run at one event loop, reused for all repeats.
+    `warmup` runs excluded from results, `disable_gc=False` keeps gc enabled while timing.
+    `isolate=True` (or "func") runs every function in fresh process, "repeat" - process per repeat,
+    processes can be pinned to `cpu_affinity` cpus.
+    `progress` - "rich", "batched" (update not more often than every `progress_interval_ms`) or "none" (headless).
+    `memory=True` - after timed runs, one more run w/ tracemalloc: peak and net allocated bytes, RSS delta.
+    `order` - "sequential" (all repeats of function, then next one), "interleaved" (round-robin, one run of every
+    function per round) or "random" (rounds in random order, `seed` or random one, used seed at `order_seed`)."""
 
     _max_name_len: int = 0
+    _print_after_run: bool = True
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_pid: Optional[int] = None
     progress_bar: Progress
-    _results: Dict[str, List[float]]
+    _results: Dict[str, BenchmarkResult]
+    memory_results: Dict[str, MemoryResult]
+    profiles: Dict[str, Path]
+    _profile: Union[bool, str, None] = None
+    _profile_dir: Union[str, Path] = "profiles"
+    _profile_top: int = 10
+    _precision: Optional[float] = None
+    _min_repeats: int = 5
+    _deadline: Optional[float] = None
+    _func_deadline: Optional[float] = None
     func_dict: Dict[str, AnyFunc]
 
     def __init__(
@@ -60,15 +313,47 @@ class Benchmark:
         func: Union[AnyFunc, Dict[str, AnyFunc], List[AnyFunc]],
         num_repeats: int = 5,
         clear_progress: bool = True,
+        number: int = 1,
+        autorange: bool = False,
+        target_time: float = 0.2,
+        warmup: int = 0,
+        disable_gc: bool = True,
+        isolate: Union[bool, str] = False,
+        cpu_affinity: Optional[List[int]] = None,
+        progress: str = "rich",
+        progress_interval_ms: int = 100,
+        memory: bool = False,
+        order: str = "sequential",
+        seed: Optional[int] = None,
     ):
+        if isolate not in (False, True, "func", "repeat"):
+            raise ValueError(f"isolate should be bool, 'func' or 'repeat', got {isolate!r}")
+        if order not in ORDERS:
+            raise ValueError(f"order should be one of {', '.join(ORDERS)}, got {order!r}")
+        if order != "sequential" and isolate not in (False, "repeat"):
+            raise ValueError("interleaved order needs isolate=False or 'repeat', process per function runs ahead")
+        self.order = order
+        self.seed = seed
+        self.order_seed: Optional[int] = None
+        if progress not in PROGRESS_MODES:
+            raise ValueError(f"progress should be one of {', '.join(PROGRESS_MODES)}, got {progress!r}")
+        self.progress = progress
+        self.progress_interval_ms = progress_interval_ms
+        self.memory = memory
         self.num_repeats = num_repeats
+        self.warmup = warmup
+        self.disable_gc = disable_gc
+        self.isolate = isolate
+        self.cpu_affinity = cpu_affinity
+        self.number = number
+        self.autorange = autorange
+        self.target_time = target_time
         if isinstance(func, dict):
             self.func_dict = func
         elif isinstance(func, list):
             self.func_dict = {get_func_name(func_item): func_item for func_item in func}
         else:
             self.func_dict = {get_func_name(func): func}
-        self._benchmark = benchmark
         self.results_header = " Func name  | Sec / run"
         self.clear_progress = clear_progress
         self._reset_results()
@@ -78,8 +363,58 @@ class Benchmark:
         func_name: Union[str, None, List[str]] = None,
         exclude: Union[str, List[str], None] = None,
         num_repeats: Union[int, None] = None,
+        profile: Union[bool, str, None] = None,
+        profile_dir: Union[str, Path] = "profiles",
+        profile_top: int = 10,
+        precision: Optional[float] = None,
+        min_repeats: int = 5,
+        max_repeats: int = 100,
+        time_budget: Optional[float] = None,
     ) -> None:
-        """Run benchmark, can run only ones you need, exclude that you don't need"""
+        """Run benchmark, can run only ones you need, exclude that you don't need.
+        `profile=True` (or "cprofile") - after timed runs, one more run under cProfile,
+        stats saved to `profile_dir` as <func name>.pstats, top `profile_top` functions printed.
+        Adaptive stopping: with `precision` (relative width of 95% confidence interval of mean, 0.05 - 5%)
+        or `time_budget` (sec, for all functions) function runs from `min_repeats` to `max_repeats` times,
+        until precision reached or its share of budget spent, `num_repeats` ignored."""
+        if profile not in (None, False, True) + PROFILERS:
+            raise ValueError(f"profile should be bool or one of: {', '.join(PROFILERS)}, got {profile!r}")
+        if min_repeats < 2 or max_repeats < min_repeats:
+            raise ValueError(f"need 2 <= min_repeats <= max_repeats, got {min_repeats}, {max_repeats}")
+        self._profile = profile
+        self._profile_dir = profile_dir
+        self._profile_top = profile_top
+        self._precision = precision
+        self._min_repeats = min_repeats
+        self._deadline = perf_counter() + time_budget if time_budget is not None else None
+        if self._adaptive:
+            num_repeats = max_repeats
+        try:
+            self._run(self._select(func_name, exclude), num_repeats)
+        finally:
+            self._profile = None
+            self._precision = None
+            self._deadline = None
+            self._func_deadline = None
+
+    @property
+    def _adaptive(self) -> bool:
+        return self._precision is not None or self._deadline is not None
+
+    def _stop(self, result: BenchmarkResult) -> bool:
+        """Adaptive stopping: precision reached or function share of time budget spent, after min_repeats"""
+        if len(result) < self._min_repeats:
+            return False
+        if self._func_deadline is not None and perf_counter() >= self._func_deadline:
+            return True
+        return self._precision is not None and result.relative_ci_width() <= self._precision
+
+    def _select(
+        self,
+        func_name: Union[str, None, List[str]] = None,
+        exclude: Union[str, List[str], None] = None,
+    ) -> List[str]:
+        """Return func names to run"""
         if func_name:
             if isinstance(func_name, str):
                 func_name = [func_name]
@@ -95,8 +430,7 @@ class Benchmark:
                 self._print_missed(exclude)
         else:
             func_to_test = list(self.func_dict)
-
-        self._run(func_to_test, num_repeats)
+        return func_to_test
 
     def _print_missed(self, func_names: List[str]) -> None:
         for func in func_names:
@@ -105,6 +439,8 @@ class Benchmark:
 
     def _reset_results(self) -> None:
         self._results = {}  # ? if exists add new
+        self.memory_results = {}
+        self.profiles = {}
 
     def _run(
         self,
@@ -121,43 +457,296 @@ class Benchmark:
             num_funcs = len(func_names)
             self._max_name_len = max(len(func_name) for func_name in func_names)
             text_color = "[green]"
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TimeRemainingColumn(elapsed_when_finished=True),
+            from rich.progress import BarColumn, TaskProgressColumn, TextColumn, TimeRemainingColumn
+
+            with create_progress(
+                self.progress,
+                [
+                    TextColumn("[progress.description]{task.description}"),
+                    BarColumn(),
+                    TaskProgressColumn(),
+                    TimeRemainingColumn(elapsed_when_finished=True),
+                ],
                 transient=self.clear_progress,
             ) as progress_bar:
                 self.progress_bar = progress_bar
                 main_task = self.progress_bar.add_task("starting...", total=num_funcs)
-                for num, func_name in enumerate(func_names):
+                if self.order == "sequential":
+                    for num, func_name in enumerate(func_names):
+                        self.progress_bar.tasks[  # pylint: disable=invalid-sequence-index
+                            main_task
+                        ].description = f"{text_color}running {func_name} {num + 1}/{num_funcs}"
+                        if self._deadline is not None:  # budget left shared by functions left
+                            self._func_deadline = perf_counter() + (self._deadline - perf_counter()) / (num_funcs - num)
+                        self._results[func_name] = self._run_benchmark(func_name, num_repeats=num_repeats)
+                        self.progress_bar.update(main_task, advance=1)
+                else:
                     self.progress_bar.tasks[  # pylint: disable=invalid-sequence-index
                         main_task
-                    ].description = f"{text_color}running {func_name} {num + 1}/{num_funcs}"
-                    self._results[func_name] = self._run_benchmark(func_name, num_repeats=num_repeats)
-                    self.progress_bar.update(main_task, advance=1)
+                    ].description = f"{text_color}running {num_funcs} functions, {self.order}"
+                    self._run_interleaved(list(func_names), num_repeats, main_task)
+                self._after_funcs()
                 self.progress_bar.tasks[  # pylint: disable=invalid-sequence-index
                     main_task
                 ].description = f"{text_color}done {num_funcs} runs."
                 columns = self.progress_bar.columns
-                self.progress_bar.columns = (
-                    columns[0],
-                    columns[3],
-                )  # remove BarColumn and TaskProgressColumn
+                if columns:
+                    self.progress_bar.columns = (
+                        columns[0],
+                        columns[3],
+                    )  # remove BarColumn and TaskProgressColumn
 
+            self._close_loop()
             self._after_run()
 
+    def _run_interleaved(self, func_names: List[str], num_repeats: int, main_task: TaskID) -> None:
+        """Run functions by rounds, one sample from every function per round, in random order for "random" """
+        if self.order == "random":
+            self.order_seed = self.seed if self.seed is not None else random.randrange(2**32)
+        rng = random.Random(self.order_seed) if self.order == "random" else None
+        self._func_deadline = self._deadline  # all functions share whole budget
+        for func_name in func_names:
+            self._before_samples(func_name)
+        sources = {func_name: iter(self._iter_samples(func_name, num_repeats)) for func_name in func_names}
+        collectors = {
+            func_name: SampleCollector(f"{func_name:{self._max_name_len}}", num_repeats, self.progress_bar)
+            for func_name in func_names
+        }
+        for func_name, sample in interleave(sources, rng):
+            collectors[func_name].add(sample)
+        for func_name in func_names:
+            self._results[func_name] = collectors[func_name].finish()
+            self._after_samples(func_name)
+            self.progress_bar.update(main_task, advance=1)
+
+    def _print_order(self) -> None:
+        if self.order == "interleaved":
+            rprint("Order: interleaved, round-robin")
+        elif self.order == "random":
+            rprint(f"Order: random blocks, seed {self.order_seed}")
+
+    def _after_funcs(self) -> None:
+        """Called after all functions run, progress and workers still active"""
+
     def _after_run(self) -> None:
-        self.print_results()
+        if self._print_after_run:
+            self._print_order()
+            self.print_results()
+            self.print_profiles()
+
+    @property
+    def _progress_interval(self) -> float:
+        """Min interval between progress updates, sec"""
+        return self.progress_interval_ms / 1000 if self.progress == "batched" else 0.0
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return event loop, one for all repeats and functions, new one at forked (isolated) process"""
+        if self._loop is None or self._loop_pid != os.getpid():
+            import asyncio
+
+            self._loop = asyncio.new_event_loop()
+            self._loop_pid = os.getpid()
+        return self._loop
+
+    def _close_loop(self) -> None:
+        if self._loop is not None and self._loop_pid == os.getpid():
+            self._loop.close()
+        self._loop = None
+
+    def _get_func(self, func_name: str) -> AnyFunc:
+        """Return func to be timed, coroutine function run at event loop"""
+        func = self.func_dict[func_name]
+        if inspect.iscoroutinefunction(func):
+            loop = self._get_loop()
+            return lambda: loop.run_until_complete(func())  # type: ignore
+        return func
+
+    def _isolated_state(self, func_name: str) -> Dict[str, Any]:
+        """Return state from isolated worker process, to be merged at parent"""
+        return {"memory": self.memory_results.get(func_name), "profile": self.profiles.get(func_name)}
+
+    def _merge_isolated_state(self, func_name: str, state: Dict[str, Any]) -> None:
+        """Merge state from isolated worker process"""
+        if state["memory"] is not None:
+            self.memory_results[func_name] = state["memory"]
+        if state["profile"] is not None:
+            self.profiles[func_name] = state["profile"]
+
+    def profile_func(self, func_name: str) -> Path:
+        """Run func once under profiler, not timed, save stats to `profile_dir`"""
+        return profile_func(self._get_func(func_name), profile_path(self._profile_dir, func_name))
+
+    def print_profiles(self, top: Optional[int] = None) -> None:
+        """Print top hot functions (by cumulative time) from saved profiles"""
+        for func_name, path in self.profiles.items():
+            rprint(f"{func_name} profile: {path}")
+            rprint("   ncalls |    tottime |    cumtime | function")
+            for entry in top_functions(path, top or self._profile_top):
+                rprint(
+                    f"{entry.ncalls:9} | {format_time(entry.tottime):>10} | {format_time(entry.cumtime):>10} | "
+                    f"{escape(entry.func)}"
+                )
+
+    def measure_memory(self, func_name: str) -> MemoryResult:
+        """Run func once, not timed, return tracemalloc peak, net allocated bytes and RSS delta"""
+        peak, net, rss_delta = trace_memory(self._get_func(func_name))
+        return MemoryResult(peak, net, rss_delta)
+
+    def _memory_info(self, func_name: str) -> str:
+        memory = self.memory_results.get(func_name)
+        if memory is None:
+            return ""
+        return f" | peak {format_bytes(memory.peak)}, net {format_bytes(memory.net)}"
+
+    def _run_benchmark(self, func_name: str, num_repeats: int) -> BenchmarkResult:
+        self._before_samples(func_name)
+        result = self._run_samples(func_name, num_repeats)
+        self._after_samples(func_name)
+        return result
+
+    def _before_samples(self, func_name: str) -> None:
+        """Called before timed runs of function"""
+
+    def _warmup_context(self, func_name: str) -> ContextManager[Any]:
+        """Context for warmup runs of function"""
+        return nullcontext()
+
+    def _start_pool(self) -> None:
+        """Start workers for timed runs, outside timed region (BenchmarkIter)"""
+
+    def _close_pool(self) -> None:
+        """Stop workers started by `_start_pool`"""
 
-    def _run_benchmark(self, func_name: str, num_repeats: int) -> List[float]:
-        return self._benchmark(
+    def _after_samples(self, func_name: str) -> None:
+        """Called after timed runs of function: not timed memory and profile runs"""
+        if self.memory and not self.isolate:  # isolated - measured at worker
+            self.memory_results[func_name] = self.measure_memory(func_name)
+        if self._profile and not self.isolate:
+            self.profiles[func_name] = self.profile_func(func_name)
+
+    def _iter_samples(self, func_name: str, num_repeats: int) -> Iterator[Sample]:
+        """Return samples for function, isolated or at this process"""
+        stop = self._stop if self._adaptive else None
+        if self.isolate:
+            return run_isolated(
+                self,
+                func_name,
+                num_repeats,
+                per_repeat=self.isolate == "repeat",
+                cpus=self.cpu_affinity,
+                stop=stop,
+            )
+        func = self._get_func(func_name)
+        number = calibrate(func, self.target_time, self.disable_gc) if self.autorange else self.number
+        return iter_samples(
+            func,
+            num_repeats,
+            number=number,
+            warmup=self.warmup,
+            disable_gc=self.disable_gc,
+            children_cpu=self.children_cpu_time,
+            stop=stop,
+            warmup_context=self._warmup_context(func_name),
+        )
+
+    def _run_samples(self, func_name: str, num_repeats: int) -> BenchmarkResult:
+        return collect_samples(
             f"{func_name:{self._max_name_len}}",
-            self.func_dict[func_name],
+            self._iter_samples(func_name, num_repeats),
             num_repeats,
             self.progress_bar,
         )
 
+    def parametrize(
+        self,
+        params: Sequence[Any],
+        setup: Optional[Callable[[Any], Any]] = None,
+        size: Optional[Callable[[Any], float]] = None,
+        func_name: Union[str, None, List[str]] = None,
+        exclude: Union[str, List[str], None] = None,
+        num_repeats: Optional[int] = None,
+        **kwargs: Any,
+    ) -> ParamReport:
+        """Run benchmark for every value at `params`, functions called with argument - param or `setup(param)`,
+        setup not timed. Input size - `size(param)`, param if number, else len of argument.
+        Return and print tidy table and fit of median time over size: O(1), O(log n), O(n), O(n log n), O(n^2).
+        `kwargs` passed to `run`."""
+        rows = []
+        self._print_after_run = False
+        try:
+            for param in params:
+                arg = setup(param) if setup is not None else param
+                param_size = size(param) if size is not None else self._param_size(arg)
+                self._run_param(arg, func_name, exclude, num_repeats, **kwargs)
+                for name, result in self.stats.items():
+                    rows.append(ParamRow(name, param, param_size, result.mean, result.median, result.stdev))
+        finally:
+            self._print_after_run = True
+        fits = {}
+        for name in dict.fromkeys(row.func_name for row in rows):
+            func_rows = [row for row in rows if row.func_name == name]
+            fits[name] = fit_complexity([row.size for row in func_rows], [row.median for row in func_rows])
+        report = ParamReport(rows, fits)
+        self.print_parametrize(report)
+        return report
+
+    def _run_param(
+        self,
+        arg: Any,
+        func_name: Union[str, None, List[str]],
+        exclude: Union[str, List[str], None],
+        num_repeats: Optional[int],
+        **kwargs: Any,
+    ) -> None:
+        """Run functions with argument"""
+        func_dict = self.func_dict
+        self.func_dict = {name: partial(func, arg) for name, func in func_dict.items()}
+        try:
+            self.run(func_name, exclude, num_repeats, **kwargs)
+        finally:
+            self.func_dict = func_dict
+
+    def _param_size(self, arg: Any) -> float:
+        """Return input size: argument if number, else its len"""
+        if isinstance(arg, (int, float)):
+            return arg
+        if not hasattr(arg, "__len__"):
+            raise ValueError(f"Can't get size of argument {type(arg).__name__}, use `size`")
+        return len(arg)
+
+    @staticmethod
+    def print_parametrize(report: ParamReport) -> None:
+        """Print parametrized results and best complexity fits, O(n^2) in red"""
+        for func_name, fits in report.fits.items():
+            if fits:
+                color = "red" if fits[0].model == "O(n^2)" else "green"
+                others = ", ".join(f"{fit.model} {fit.residual:0.1%}" for fit in fits[1:3])
+                best = f"[{color}]{fits[0].model}[/{color}] (residual {fits[0].residual:0.1%})"
+                rprint(f"{func_name}: {best}, next: {others}")
+            else:
+                rprint(f"{func_name}: not enough sizes to fit complexity")
+            rprint("      Param |       Size |       Mean |     Median |      Stdev")
+            for row in report.rows:
+                if row.func_name == func_name:
+                    rprint(
+                        f"{escape(str(row.param)):>11.11} | {row.size:10.4g} | {format_time(row.mean):>10} | "
+                        f"{format_time(row.median):>10} | {format_time(row.stdev):>10}"
+                    )
+
+    def children_cpu_time(self) -> float:
+        """Cumulative cpu time (sec) of worker processes, not counted by rusage"""
+        return 0.0
+
+    def _precision_info(self, func_name: str) -> str:
+        if not self._adaptive:
+            return ""
+        result = self._results[func_name]
+        return f" | ci width {result.relative_ci_width():0.1%}, {len(result)} runs"
+
+    def _cpu_info(self, func_name: str) -> str:
+        utilization = self._results[func_name].cpu_utilization
+        return "" if utilization is None else f" | cpu {utilization:0.2f}"
+
     def __call__(self, num_repeats: Union[int, None] = None) -> None:
         if num_repeats is None:
             num_repeats = self.num_repeats
@@ -167,25 +756,100 @@ class Benchmark:
     def results(self) -> Dict[str, float]:
         """Return dict w/ results"""
         if self._results:
-            return {name: sum(res_list) / len(res_list) for name, res_list in self._results.items()}
+            return {name: result.mean for name, result in self._results.items()}
         return {}
 
+    @property
+    def stats(self) -> Dict[str, BenchmarkResult]:
+        """Return dict w/ results objects - samples and statistics"""
+        return dict(self._results)
+
+    @property
+    def loops(self) -> Dict[str, int]:
+        """Return dict w/ number of loops per run"""
+        return {name: result.loops for name, result in self._results.items()}
+
     def print_results(
         self,
         results_header: Optional[str] = None,
         sort: bool = True,
         reverse: bool = False,
         compare: bool = True,
+        columns: Optional[List[str]] = None,
     ) -> None:
-        """Print results of benchmark"""
+        """Print results of benchmark.
+        `columns` - statistics to print, any of: mean, min, median, max, stdev, iqr, p95, p99, ci, outliers,
+        cpu_util, user, sys (cpu time per call), ctx_vol, ctx_invol (context switches per call), faults (page faults
+        per call), and with `memory=True`: mem_peak, mem_net, rss_delta, mem_per_item, workers_max_rss."""
+        per_call = any(number > 1 for number in self.loops.values())
+        if columns:
+            self._print_stats(columns, sort=sort, reverse=reverse)
+            return
+        if per_call and results_header is None:
+            results_header = " Func name  | Time / call"
         self._print_results(
             results=None,
             results_header=results_header,
             sort=sort,
             reverse=reverse,
             compare=compare,
+            fmt=format_time if per_call else None,
+            extra={
+                name: (f" x {result.loops} loops" if per_call else "")
+                + self._precision_info(name)
+                + self._cpu_info(name)
+                + self._memory_info(name)
+                for name, result in self._results.items()
+            },
         )
 
+    def _print_stats(
+        self,
+        columns: List[str],
+        sort: bool = True,
+        reverse: bool = False,
+    ) -> None:
+        """Print table of statistics, time values w/ units"""
+        known = STAT_COLUMNS + CPU_COLUMNS + MEMORY_COLUMNS
+        wrong = [column for column in columns if column not in known]
+        if wrong:
+            raise ValueError(f"Unknown columns: {', '.join(wrong)}, use: {', '.join(known)}")
+        name_len = max(12, *(len(name) for name in self._results))
+        rprint(f"{'Func name':{name_len}} | " + " | ".join(f"{column:>10}" for column in columns))
+        func_names = list(self._results)
+        if sort:
+            func_names = sorted(func_names, key=lambda name: self._results[name].mean, reverse=reverse)
+        for func_name in func_names:
+            result = self._results[func_name]
+            values = []
+            for column in columns:
+                if column == "ci":
+                    ci_low, ci_high = result.ci()
+                    values.append(f"{format_time(ci_low)}..{format_time(ci_high)}")
+                elif column == "outliers":
+                    values.append(f"{result.outliers_tukey()}/{result.outliers_mad()}")
+                elif column in CPU_COLUMNS:
+                    values.append(f"{self._format_cpu(result, column):>10}")
+                elif column in MEMORY_COLUMNS:
+                    memory = self.memory_results.get(func_name)
+                    values.append(f"{format_bytes(memory.column(column) if memory else None):>10}")
+                else:
+                    values.append(f"{format_time(getattr(result, column)):>10}")
+            rprint(f"{func_name:{name_len}} | " + " | ".join(values))
+
+    @staticmethod
+    def _format_cpu(result: BenchmarkResult, column: str) -> str:
+        """Cpu column: utilization ratio, times and counts per call"""
+        total = result.cpu_total
+        if total is None:
+            return "-"
+        if column == "cpu_util":
+            return "-" if total.utilization is None else f"{total.utilization:0.2f}"
+        value = total.column(column) / (len(result) * result.loops)
+        if column in ("user", "sys"):
+            return format_time(value)
+        return f"{value:0.3g}"
+
     def _print_results(
         self,
         results: Optional[Dict[str, float]] = None,
@@ -193,6 +857,8 @@ class Benchmark:
         sort: bool = True,
         reverse: bool = False,
         compare: bool = False,
+        fmt: Optional[Callable[[float], str]] = None,
+        extra: Optional[Dict[str, str]] = None,
     ) -> None:
         if results_header is None:
             results_header = self.results_header
@@ -204,11 +870,60 @@ class Benchmark:
             func_names = sorted(func_names, key=results.get, reverse=reverse)  # type: ignore
         best_res = results[func_names[0]]
         for func_name in func_names:
-            line = f"{func_name:12}: {results[func_name]:6.2f}"
+            if fmt is None:
+                line = f"{func_name:12}: {results[func_name]:6.2f}"
+            else:
+                line = f"{func_name:12}: {fmt(results[func_name]):>10}"
+            if extra is not None:
+                line += extra.get(func_name, "")
             if compare:
                 line += f" {(best_res / results[func_name]) - 1:0.1%}"
             rprint(line)
 
+    def save(
+        self,
+        path: Union[str, Path, ResultStore],
+        version: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Save results to results history store (json lines file), version - package version by default"""
+        if version is None:
+            from .version import cached_version
+
+            version = cached_version()
+        store = path if isinstance(path, ResultStore) else ResultStore(path)
+        store.save(self._results, version=version, tag=tag)
+
+    def compare_to(
+        self,
+        baseline: Union[str, Path, ResultStore, Benchmark, Dict[str, BenchmarkResult]],
+        threshold: float = 0.05,
+        alpha: float = 0.05,
+        **filters: Any,
+    ) -> int:
+        """Compare results with baseline: store (last results, filtered by keys), other Benchmark or dict of results.
+        Store results filtered by this host by default, `host=None` - any host.
+        Print comparison, return 1 if any function regressed, else 0."""
+        if isinstance(baseline, (str, Path)):
+            baseline = ResultStore(baseline)
+        if isinstance(baseline, ResultStore):
+            filters.setdefault("host", host_fingerprint())
+            if filters["host"] is None:
+                del filters["host"]
+            baseline = baseline.latest(**filters)
+        elif isinstance(baseline, Benchmark):
+            baseline = baseline.stats
+        comparisons = compare_results(self._results, baseline, threshold=threshold, alpha=alpha)
+        rprint(" Func name  | Baseline | Current | Change | p-value")
+        for comparison in comparisons:
+            base = "-" if comparison.baseline is None else format_time(comparison.baseline)
+            line = (
+                f"{comparison.func_name:12}: {base} | {format_time(comparison.current)} | "
+                f"{comparison.change:+0.1%} | {comparison.p_value:0.3f} {comparison.status}"
+            )
+            rprint(line)
+        return int(any(comparison.status == "regression" for comparison in comparisons))
+
     @property
     def func_names(self) -> str:
         """Return func names as string"""
@@ -222,77 +937,557 @@ class Benchmark:
 
 
 def try_run(func: AnyFunc, item: Any) -> dict[str, Any] | None:
-    """Run func, return None or exception message"""
+    """Run func, return None or exception info: type, message, item and exception"""
     try:
         func(item)
         return None
     except Exception as e:  # pylint: disable=broad-except
-        return {"exception": e, "item": item}
+        return exception_info(e, item)
+
+
+def try_run_timed(
+    func: AnyFunc, indexed_item: Tuple[int, Any], local: bool = True, run: str = ""
+) -> Tuple[int, int, int, dict[str, Any] | None]:
+    """Run func on (index, item), return index, run time in ns, cpu time of thread in ns
+    and None or exception info, made after timing. `local` - run at same process, live exception returned,
+    else at worker process - traceback formatted only for first exceptions of type and message at `run`."""
+    index, item = indexed_item
+    exception = None
+    cpu_start = thread_time_ns()
+    start = perf_counter_ns()
+    try:
+        func(item)
+    except Exception as e:  # pylint: disable=broad-except
+        exception = e
+    end = perf_counter_ns()
+    cpu_time = thread_time_ns() - cpu_start
+    return index, end - start, cpu_time, None if exception is None else exception_info(exception, item, local, run)
+
+
+def try_run_shared(
+    func: AnyFunc, shared: SharedRef, indexed_item: Tuple[int, int], run: str = ""
+) -> Tuple[int, int, int, dict[str, Any] | None]:
+    """Run func on shared item by index, as try_run_timed, view of item taken before timing"""
+    index, item_index = indexed_item
+    index, run_time, cpu_time, result = try_run_timed(
+        func, (index, shared_item(shared, item_index)), local=False, run=run
+    )
+    if result:
+        result["item"] = f"shared item {item_index}"  # view can't be sent back
+    return index, run_time, cpu_time, result
+
+
+def try_run_traced(
+    run: Callable[[Tuple[int, Any]], Tuple[int, int, int, dict[str, Any] | None]], indexed_item: Tuple[int, Any]
+) -> Tuple[int, int, int, dict[str, Any] | None, int, int, int]:
+    """Run item by `run` (try_run_timed or try_run_shared), also return start time (ns), pid and thread id"""
+    start = perf_counter_ns()
+    return (*run(indexed_item), start, os.getpid(), get_native_id())
+
+
+def set_item_time(item_times: array[int], index: int, run_time: int) -> None:
+    """Set run time for item by index, grow array if number of items was unknown"""
+    if index >= len(item_times):
+        item_times.extend([0] * (index + 1 - len(item_times)))
+    item_times[index] = run_time
+
+
+def _noop(_: Any) -> None:
+    """Empty function, to measure harness overhead"""
+
+
+def _warmup_worker(_: Any) -> int:
+    return os.getpid()
+
+
+CHUNKSIZE_CANDIDATES = (1, 4, 16, 64, 256)
+CHUNKSIZE_PROBE_ITEMS = 1000
 
 
 class BenchmarkIter(Benchmark):
-    """Benchmark func over item_list"""
+    """Benchmark func over items: `item_list` - sequence, re-iterable object or factory returning iterable,
+    iterated lazily, `num_samples` taken by islice. Number of items - `length`, len of items, or unknown.
+    Helpers for big datasets at `sources`: FileLines, DirFiles, MmapRecords.
+    With multiprocessing, pool of workers created and warmed once per run, outside timed region,
+    and reused for all repeats and functions, startup time at `pool_startup_time`.
+    Items sent to workers by `chunksize` (threads, processes), "auto" - fastest from probe runs, used values at
+    `chunksizes`; interpreters backend sends items one by one, 2 per worker in flight.
+    Backends: serial, threads, processes (same as `multiprocessing=True`), interpreters (python 3.14+).
+    Exceptions aggregated at `exceptions` by type and message: counts, up to `max_exception_samples` sample items
+    w/ formatted tracebacks, time of failed items reported apart from ok ones.
+    Coroutine functions run at event loop, up to `concurrency` items in flight,
+    latency per item (ns) at `item_times`.
+    Cpu time of worker processes (processes backend) summed from items and included to cpu usage.
+    With `shared` (processes backend) items placed once to shared memory ("shm") or memory mapped file ("mmap"),
+    workers get only indices and function gets views: read only memoryview for bytes-like, numpy array for arrays.
+    With `trace` timeline of repeats, items and chunks per worker process recorded at `trace`,
+    can be saved as Chrome trace-event json (open at ui.perfetto.dev)."""
 
     _num_samples: Optional[int] = None
-    _multiprocessing: Optional[bool] = None
+    _backend: str = "serial"
     _num_workers: Optional[int] = None
+    _chunksize: Union[int, str, None] = None
+    _ordered: bool = True
+    _concurrency: int = 1
+    chunksizes: Dict[str, int]
+    item_times: Dict[str, array[int]]
+    _pool: Optional[AnyPool] = None
+    pool_startup_time: Optional[float] = None
+    harness_overhead: Optional[float] = None
+    _worker_pids: Set[int] = set()
+    _workers_cpu_ns: int = 0
+    _pool_runs: int = 0
+    _shared_kind: Optional[str] = None
+    _shared: Optional[SharedItems] = None
+    shared_setup_time: Optional[float] = None
+    _trace: Union[bool, str, Path, None] = None
+    trace: Optional[TraceRecorder] = None
+    trace_path: Optional[Path] = None
 
     def __init__(
         self,
         func: Union[AnyFunc, Dict[str, AnyFunc], List[AnyFunc]],
-        item_list: List[Any],
+        item_list: AnySource,
         num_repeats: int = 5,
         clear_progress: bool = True,
+        warmup: int = 0,
+        disable_gc: bool = True,
+        isolate: Union[bool, str] = False,
+        cpu_affinity: Optional[List[int]] = None,
+        progress: str = "rich",
+        progress_interval_ms: int = 100,
+        memory: bool = False,
+        order: str = "sequential",
+        seed: Optional[int] = None,
+        length: Optional[int] = None,
+        max_exception_samples: int = MAX_EXCEPTION_SAMPLES,
     ):
-        super().__init__(func, num_repeats=num_repeats, clear_progress=clear_progress)
-        self.item_list = item_list
-        self.exceptions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-
-    def _run_benchmark(self, func_name: str, num_repeats: int) -> List[float]:
-        return self._benchmark(
-            f"{func_name:{self._max_name_len}}",
-            self.run_func_iter(func_name),
-            num_repeats,
-            self.progress_bar,
+        self.max_exception_samples = max_exception_samples  # used at reset on init
+        super().__init__(
+            func,
+            num_repeats=num_repeats,
+            clear_progress=clear_progress,
+            warmup=warmup,
+            disable_gc=disable_gc,
+            isolate=isolate,
+            cpu_affinity=cpu_affinity,
+            progress=progress,
+            progress_interval_ms=progress_interval_ms,
+            memory=memory,
+            order=order,
+            seed=seed,
         )
+        self.items = ItemSource(item_list, length)
+        self.exceptions: Dict[str, ExceptionLog] = defaultdict(partial(ExceptionLog, max_exception_samples))
+
+    @property
+    def item_list(self) -> AnySource:
+        """Items source as given"""
+        return self.items.source
+
+    @item_list.setter
+    def item_list(self, item_list: AnySource) -> None:
+        self.items = ItemSource(item_list)
+
+    def _iter_items(self) -> Iterator[Any]:
+        """Return iterator over items for run, `num_samples` or all"""
+        return self.items.iter(self._num_samples)
+
+    def items_per_run(self, func_name: str) -> int:
+        """Return number of items at one run of function, counted at timed runs"""
+        return len(self.item_times[func_name]) // max(len(self._results[func_name]), 1)
+
+    @contextmanager
+    def _not_recorded(self, func_name: str) -> Iterator[None]:
+        """Runs inside (warmup, memory, profile) not added to item times, exceptions and trace"""
+        num_times = len(self.item_times[func_name])
+        exceptions = self.exceptions.pop(func_name, None)
+        trace, self.trace = self.trace, None
+        try:
+            yield
+        finally:
+            self.trace = trace
+            del self.item_times[func_name][num_times:]
+            self.exceptions.pop(func_name, None)
+            if exceptions is not None:
+                self.exceptions[func_name] = exceptions
+
+    def _warmup_context(self, func_name: str) -> ContextManager[Any]:
+        """Warmup runs not added to item times, exceptions and trace"""
+        return self._not_recorded(func_name)
+
+    def _get_func(self, func_name: str) -> AnyFunc:
+        return self.run_func_iter(func_name)  # type: ignore
+
+    def _isolated_state(self, func_name: str) -> Dict[str, Any]:
+        return {
+            **super()._isolated_state(func_name),
+            "exceptions": self.exceptions.get(func_name),
+            "item_times": self.item_times.get(func_name, array("q")),
+            "trace": self.trace,
+            "pool_startup_time": self.pool_startup_time,
+        }
+
+    def _merge_isolated_state(self, func_name: str, state: Dict[str, Any]) -> None:
+        super()._merge_isolated_state(func_name, state)
+        if state["exceptions"]:
+            self.exceptions[func_name].merge(state["exceptions"])
+        if state["item_times"]:
+            self.item_times[func_name].extend(state["item_times"])
+        if state["trace"] is not None and self.trace is not None:
+            self.trace.merge(state["trace"])
+        if state["pool_startup_time"] is not None:  # pool per worker process, total startup time
+            self.pool_startup_time = (self.pool_startup_time or 0.0) + state["pool_startup_time"]
 
     def _reset_results(self) -> None:
-        self.exceptions = defaultdict(list)
+        self.exceptions = defaultdict(partial(ExceptionLog, self.max_exception_samples))
+        self.chunksizes = {}
+        self.item_times = defaultdict(lambda: array("q"))
+        self.trace = TraceRecorder() if self._trace else None
+        self.trace_path = None
         super()._reset_results()
 
+    def _get_num_workers(self) -> int:
+        if self._num_workers is not None:
+            if self._backend == "threads":  # threads can wait on io, not limited by cpu count
+                return self._num_workers
+            return min(self._num_workers, os.cpu_count() or 1)
+        return os.cpu_count() or 1
+
+    @property
+    def backend_info(self) -> str:
+        """Return backend description: name, number of workers, free-threaded, unordered"""
+        if self._backend == "serial":
+            return "serial"
+        info = f"{self._backend} x{self._get_num_workers()}"
+        if self._backend == "threads" and is_free_threaded():
+            info += ", free-threaded"
+        if not self._ordered:
+            info += ", unordered"
+        return info
+
+    def _start_pool(self) -> None:
+        """Create pool and warm up workers, time it"""
+        if self._backend == "serial":
+            return
+        start = perf_counter()
+        num_workers = self._get_num_workers()
+        self._pool = create_pool(self._backend, num_workers)
+        self._worker_pids = set(self._pool.map(_warmup_worker, range(num_workers), chunksize=1))
+        self.pool_startup_time = perf_counter() - start
+
+    def _close_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _run(
+        self,
+        func_names: Union[List[str], Dict[str, AnyFunc]],
+        num_repeats: Union[int, None] = None,
+    ) -> None:
+        self.pool_startup_time = None
+        self.shared_setup_time = None
+        if func_names and not self.isolate:  # isolated - pool started at worker process
+            self._start_pool()
+        try:
+            if self._shared_kind is not None and func_names:
+                start = perf_counter()
+                self._shared = SharedItems(self._iter_items(), self._shared_kind)
+                self.shared_setup_time = perf_counter() - start
+            super()._run(func_names, num_repeats)
+        finally:
+            self._close_pool()
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+
+    def measure_memory(self, func_name: str) -> MemoryResult:
+        """Run func over items once, not timed: tracemalloc peak and net allocated bytes, RSS delta,
+        tracemalloc peak per item (serial backend), max RSS of worker processes (processes backend)"""
+        with self._not_recorded(func_name):
+            memory = super().measure_memory(func_name)
+        func = self.func_dict[func_name]
+        per_item = None
+        if self._backend == "serial" and not inspect.iscoroutinefunction(func):
+            per_item = memory_per_item(func, self._iter_items())
+        workers_max_rss = None
+        if self._backend == "processes":
+            workers_max_rss = processes_max_rss(self._worker_pids)
+        return memory._replace(per_item=per_item, workers_max_rss=workers_max_rss)
+
+    def _memory_info(self, func_name: str) -> str:
+        info = super()._memory_info(func_name)
+        memory = self.memory_results.get(func_name)
+        if memory is not None and memory.per_item is not None:
+            info += f", {format_bytes(memory.per_item)}/item"
+        if memory is not None and memory.workers_max_rss is not None:
+            info += f", workers max RSS {format_bytes(memory.workers_max_rss)}"
+        return info
+
+    def _after_funcs(self) -> None:
+        self.harness_overhead = None
+        if self.progress != "rich":
+            self.harness_overhead = self.measure_overhead()
+        if self.trace is not None and isinstance(self._trace, (str, Path)):
+            self.trace_path = self.trace.save(self._trace)
+
+    def measure_overhead(self, num_repeats: int = 3) -> float:
+        """Return harness time per item (sec): empty function run over items by same path -
+        backend, progress mode, per item timing. Best of num_repeats."""
+        name = "_harness_overhead"
+        self.func_dict[name] = _noop
+        self.chunksizes[name] = self._chunksize if isinstance(self._chunksize, int) else 1
+        trace, self.trace = self.trace, None
+        try:
+            func = self.run_func_iter(name)
+            with self._pool_started():
+                run_time = min(time_func(func) for _ in range(num_repeats))
+            num_items = len(self.item_times[name]) // num_repeats
+        finally:
+            self.trace = trace
+            del self.func_dict[name]
+            for state in (self.chunksizes, self.item_times, self.exceptions):
+                state.pop(name, None)  # type: ignore
+        return run_time / max(num_items, 1)
+
+    @contextmanager
+    def _pool_started(self) -> Iterator[None]:
+        """Use running pool, or start one for the block (isolated run - parent process has no pool)"""
+        if self._pool is not None or self._backend == "serial":
+            yield
+            return
+        pool_startup_time = self.pool_startup_time
+        self._start_pool()
+        try:
+            yield
+        finally:
+            self._close_pool()
+            self.pool_startup_time = pool_startup_time
+
+    def _imap(
+        self,
+        pool: AnyPool,
+        func: AnyFunc,
+        items: Iterable[Any],
+        chunksize: int,
+        traced: bool = False,
+    ) -> Iterator[Any]:
+        """Run items at pool, results as from try_run_timed, try_run_traced ones if `traced`.
+        Every call - new run, tracebacks formatted at workers for first exceptions of it."""
+        imap = pool.imap if self._ordered else pool.imap_unordered
+        self._pool_runs += 1
+        run_key = f"{id(self)} {self._pool_runs}"
+        if self._shared is not None:  # items - indices at shared items
+            run: Callable[..., Any] = partial(try_run_shared, func, self._shared, run=run_key)
+        else:
+            run = partial(try_run_timed, func, local=self._backend == "threads", run=run_key)
+        if traced:
+            run = partial(try_run_traced, run)
+        return imap(run, enumerate(items), chunksize=chunksize)
+
+    def _trace_items(
+        self, func_name: str, results: Iterable[Tuple[Any, ...]], chunksize: int
+    ) -> Iterator[Tuple[int, int, int, dict[str, Any] | None]]:
+        """Record item events from try_run_traced results, yield results as from try_run_timed.
+        Chunks (items sent to worker at once) recorded when all items done."""
+        trace: TraceRecorder = self.trace  # type: ignore[assignment]
+        add = trace.add
+        chunks: Dict[int, List[int]] = {}  # chunk number: start, end, pid, tid
+        for index, run_time, cpu_time, result, start, pid, tid in results:
+            received = perf_counter_ns()
+            end = start + run_time
+            args: Dict[str, Any] = {"index": index, "lag_us": (received - end) / 1000}  # result waited at worker
+            if result:
+                args["error"] = result["type"]
+            add(func_name, "item", start, end, pid, tid, args)
+            if chunksize > 1:
+                chunk = chunks.get(index // chunksize)
+                if chunk is None:
+                    chunks[index // chunksize] = [start, end, pid, tid]
+                else:
+                    if start < chunk[0]:
+                        chunk[0] = start
+                    if end > chunk[1]:
+                        chunk[1] = end
+            trace.overhead_ns += perf_counter_ns() - received
+            yield index, run_time, cpu_time, result
+        received = perf_counter_ns()
+        for num, (start, end, pid, tid) in chunks.items():
+            add(f"{func_name} chunk", "chunk", start, end, pid, tid, {"chunk": num, "chunksize": chunksize})
+        trace.overhead_ns += perf_counter_ns() - received
+
+    def tune_chunksize(self, func_name: str) -> int:
+        """Return fastest chunksize for func_name from CHUNKSIZE_CANDIDATES, probe on part of items"""
+        func = self.func_dict[func_name]
+        if self._shared is not None:
+            probe_items: List[Any] = list(range(min(len(self._shared), CHUNKSIZE_PROBE_ITEMS)))
+        else:
+            probe_items = list(islice(self._iter_items(), CHUNKSIZE_PROBE_ITEMS))
+        max_chunksize = max(1, len(probe_items) // self._get_num_workers())
+        candidates = [chunksize for chunksize in CHUNKSIZE_CANDIDATES if chunksize <= max_chunksize]
+        times = {}
+        with self._pool_started():
+            for chunksize in candidates:
+                start = perf_counter()
+                for _ in self._imap(self._pool, func, probe_items, chunksize):  # type: ignore[arg-type]
+                    pass
+                times[chunksize] = perf_counter() - start
+        return min(times, key=times.get)  # type: ignore
+
+    def _before_samples(self, func_name: str) -> None:
+        if self._backend != "serial" and inspect.iscoroutinefunction(self.func_dict[func_name]):
+            raise ValueError(f"{func_name}: coroutine function can be run only at serial backend")
+        if self._backend in CHUNKSIZE_BACKENDS:  # interpreters - items sent one by one, chunksize not used
+            if self._chunksize == "auto":
+                self.chunksizes[func_name] = self.tune_chunksize(func_name)
+            else:
+                self.chunksizes[func_name] = self._chunksize or 1  # type: ignore
+
+    async def _run_items_async(
+        self, func_name: str, items: Iterable[Any], item_times: array[int], updater: ProgressUpdater
+    ) -> int:
+        """Run coroutine function over items, `concurrency` items in flight, return number of items"""
+        func = self.func_dict[func_name]
+        items_iter = enumerate(items)
+        num_done = 0
+
+        trace = self.trace
+        pid = os.getpid()
+
+        async def worker(slot: int) -> None:
+            nonlocal num_done
+            if trace is not None:
+                trace.name_thread(pid, slot, f"coroutine slot {slot}")
+            for index, item in items_iter:  # shared iterator - next item to free worker
+                num_done += 1
+                exception = None
+                start = perf_counter_ns()
+                try:
+                    await func(item)  # type: ignore
+                except Exception as e:  # pylint: disable=broad-except
+                    exception = e
+                run_time = perf_counter_ns() - start
+                set_item_time(item_times, index, run_time)
+                if trace is not None:
+                    trace.add(func_name, "item", start, start + run_time, pid, slot, {"index": index})
+                if exception is not None:
+                    self.exceptions[func_name].add(exception_info(exception, item), run_time)
+                    exception = None
+                updater.advance()
+
+        import asyncio
+
+        await asyncio.gather(*(worker(slot) for slot in range(1, self._concurrency + 1)))
+        return num_done
+
     def run_func_iter(self, func_name: str) -> Callable[[], None]:
-        """Return func, that run func over item_list"""
+        """Return func, that run func over items"""
         func = self.func_dict[func_name]
+        is_coroutine = inspect.iscoroutinefunction(func)
 
         def inner():
-            num_samples = self._num_samples or len(self.item_list)
-            task = self.progress_bar.add_task(f"iterating {func_name}", total=num_samples)
+            repeat_start = perf_counter_ns()
+            num_items = self.items.count(self._num_samples)
+            items = self._iter_items()
+            item_times = array("q", [0]) * (num_items or 0)  # run time per item, ns, by item index
+            task = self.progress_bar.add_task(f"iterating {func_name}", total=num_items)
+            updater = ProgressUpdater(self.progress_bar, task, interval=self._progress_interval)
 
-            if self._multiprocessing:
-                if self._num_workers is not None:
-                    num_workers = min(self._num_workers, cpu_count())
-                else:
-                    num_workers = cpu_count()
-                with Pool(num_workers) as p:
-                    for result in p.imap(
-                        partial(try_run, func),
-                        self.item_list[:num_samples],
-                    ):
-                        if result:
-                            self.exceptions[func_name].append(result)
-                        self.progress_bar.update(task, advance=1)
+            num_done = 0
+            if is_coroutine:
+                num_done = self._get_loop().run_until_complete(
+                    self._run_items_async(func_name, items, item_times, updater)
+                )
             else:
-                for item in self.item_list[:num_samples]:
-                    result = try_run(func, item)
+                for index, run_time, cpu_time, result in self._item_results(func_name, items):
+                    set_item_time(item_times, index, run_time)
+                    if self._backend == "processes":  # threads and interpreters - same process, at rusage
+                        self._workers_cpu_ns += cpu_time
                     if result:
-                        self.exceptions[func_name].append(result)
-                    self.progress_bar.update(task, advance=1)
+                        self.exceptions[func_name].add(result, run_time)
+                    num_done += 1
+                    updater.advance()
+            updater.flush()
+            del item_times[num_done:]  # less items than expected length
+            self.item_times[func_name].extend(item_times)
+            if self.trace is not None:
+                self._trace_repeat(func_name, repeat_start, num_done)
             self.progress_bar.tasks[task].visible = (  # pylint: disable=invalid-sequence-index
                 False
             )
 
         return inner
 
+    def _item_results(self, func_name: str, items: Iterator[Any]) -> Iterator[Any]:
+        """Return results of func over items as from try_run_timed, at pool or serial, recorded to trace if set.
+        Pool should be started before, never created at timed runs."""
+        func = self.func_dict[func_name]
+        traced = self.trace is not None
+        chunksize = self.chunksizes.get(func_name, 1)
+        pool = self._pool
+        if pool is None and self._backend != "serial":
+            raise RuntimeError(f"{self._backend} pool not started, it's not created at timed runs")
+        if pool is not None:
+            if self._shared is not None:
+                items = iter(range(len(self._shared)))
+            results = self._imap(pool, func, items, chunksize, traced)
+        elif traced:
+            run = partial(try_run_timed, func)
+            results = (try_run_traced(run, indexed_item) for indexed_item in enumerate(items))
+        else:
+            results = (try_run_timed(func, indexed_item) for indexed_item in enumerate(items))
+        if traced:
+            results = self._trace_items(func_name, results, chunksize)
+        return results
+
+    def _trace_repeat(self, func_name: str, start: int, num_items: int) -> None:
+        """Record repeat over items, from start (perf_counter_ns) to now"""
+        self.trace.add(  # type: ignore[union-attr]
+            func_name, "repeat", start, perf_counter_ns(), os.getpid(), get_native_id(), {"items": num_items}
+        )
+
+    def children_cpu_time(self) -> float:
+        return self._workers_cpu_ns / 1e9
+
+    def profile_func(self, func_name: str) -> Path:
+        """Profile run over items, not recorded. Pool backends - run serially at this process,
+        as profiler sees only this process, workers not profiled."""
+        if self._backend == "serial":
+            with self._not_recorded(func_name):
+                return super().profile_func(func_name)
+        func = self.func_dict[func_name]
+        return profile_func(
+            lambda: [try_run(func, item) for item in self._iter_items()], profile_path(self._profile_dir, func_name)
+        )
+
+    def _run_param(
+        self,
+        arg: Any,
+        func_name: Union[str, None, List[str]],
+        exclude: Union[str, List[str], None],
+        num_repeats: Optional[int],
+        **kwargs: Any,
+    ) -> None:
+        """Run functions over first `arg` items if int, else over `arg` as items"""
+        if isinstance(arg, int):
+            self.run(func_name, exclude, num_repeats, num_samples=arg, **kwargs)
+            return
+        items = self.items
+        self.items = ItemSource(arg)
+        try:
+            self.run(func_name, exclude, num_repeats, **kwargs)
+        finally:
+            self.items = items
+
+    def _param_size(self, arg: Any) -> float:
+        """Return number of items"""
+        num_items = self.items.count(arg) if isinstance(arg, int) else ItemSource(arg).length
+        if num_items is None:
+            raise ValueError(f"Can't get number of items for {type(arg).__name__}, use `size`")
+        return num_items
+
     def print_results_per_item(
         self,
         sort: bool = True,
@@ -300,21 +1495,159 @@ class BenchmarkIter(Benchmark):
         compare: bool = False,
     ) -> None:
         """Print results per item, you can compare and sort them"""
-        if self.exceptions:
-            rprint(f"Got {len(self.exceptions)} exceptions: {', '.join(self.exceptions.keys())}.")
-        num_items = self._num_samples or len(self.item_list)
-        results = {func_name: (1 / result * num_items) for func_name, result in self.results.items()}
-        results_header = " Func name  | Items/sec"
+        self.print_exceptions()
+        if self.pool_startup_time is not None:
+            rprint(f"Pool startup: {format_time(self.pool_startup_time)}, not included in results.")
+        if self.shared_setup_time is not None:
+            rprint(f"Shared items ({self._shared_kind}) setup: {format_time(self.shared_setup_time)}, not included.")
+        if self.harness_overhead is not None:
+            rprint(f"Harness overhead: {format_time(self.harness_overhead)}/item ({self.progress} progress), included.")
+        if self.trace is not None:
+            num_items = self.trace.count("item")
+            saved = f", saved to {self.trace_path}" if self.trace_path is not None else ""
+            rprint(
+                f"Trace: {len(self.trace)} events, recording {format_time(self.trace.overhead_ns / 1e9)}"
+                f" ({format_time(self.trace.overhead_ns / 1e9 / max(num_items, 1))}/item), included{escape(saved)}."
+            )
+        self.print_item_latency()
+        results = {
+            func_name: (1 / result * self.items_per_run(func_name)) for func_name, result in self.results.items()
+        }
+        results_header = f" Func name  | Items/sec ({self.backend_info})"
         self._print_results(
             results=results,
             results_header=results_header,
             sort=sort,
             reverse=reverse,
             compare=compare,
+            extra={
+                name: (f" chunksize {self.chunksizes[name]}" if name in self.chunksizes else "")
+                + self._precision_info(name)
+                + self._cpu_info(name)
+                + self._memory_info(name)
+                for name in self._results
+            },
         )
 
+    def ok_item_time(self, func_name: str) -> Optional[float]:
+        """Mean run time of item without exception (sec), None if all failed"""
+        item_times = self.item_times[func_name]
+        exceptions = self.exceptions.get(func_name)
+        num_failed, failed_time = (exceptions.count, exceptions.time_ns) if exceptions else (0, 0)
+        if len(item_times) <= num_failed:
+            return None
+        return (sum(item_times) - failed_time) / (len(item_times) - num_failed) / 1e9
+
+    def print_exceptions(self, top: int = 5) -> None:
+        """Print exceptions by type and message, most frequent first, time of failed and ok items"""
+        for func_name, exceptions in self.exceptions.items():
+            ok_time = self.ok_item_time(func_name)
+            rprint(
+                f"{func_name}: {exceptions.count} exceptions, {len(exceptions.summaries)} kinds, "
+                f"failed item {format_time(exceptions.mean_time)}, "
+                f"ok item {'-' if ok_time is None else format_time(ok_time)}"
+            )
+            for summary in exceptions.most_common(top):
+                items = ", ".join(repr(item)[:40] for item in summary.items)
+                rprint(
+                    f"{summary.count:8} x {escape(summary.type_name)}: {escape(summary.message[:80])} | {escape(items)}"
+                )
+
+    def item_latency(self, func_name: str) -> BenchmarkResult:
+        """Return latency per item (sec), all repeats, as results object"""
+        return BenchmarkResult(run_time / 1e9 for run_time in self.item_times[func_name])
+
+    def slowest_items(self, func_name: str, top: int = 3) -> List[Tuple[int, float]]:
+        """Return top slowest items: index at item_list and max run time (sec) over repeats"""
+        item_times = self.item_times[func_name]
+        num_items = self.items_per_run(func_name)
+        max_times: Dict[int, int] = {}
+        for num, run_time in enumerate(item_times):
+            index = num % num_items
+            max_times[index] = max(max_times.get(index, 0), run_time)
+        slowest = sorted(max_times.items(), key=lambda index_time: index_time[1], reverse=True)[:top]
+        return [(index, run_time / 1e9) for index, run_time in slowest]
+
+    def print_item_latency(self, top: int = 3) -> None:
+        """Print latency per item: p50, p90, p99, max and top slowest items w/ indices"""
+        for func_name, item_times in self.item_times.items():
+            if not item_times:
+                continue
+            latency = self.item_latency(func_name)
+            slowest = ", ".join(
+                f"#{index} {format_time(run_time)}" for index, run_time in self.slowest_items(func_name, top)
+            )
+            line = (
+                f"{func_name} latency: p50 {format_time(latency.median)}, p90 {format_time(latency.percentile(90))}, "
+                f"p99 {format_time(latency.p99)}, max {format_time(latency.max)}, slowest: {slowest}"
+            )
+            if inspect.iscoroutinefunction(self.func_dict[func_name]):
+                line += f", concurrency {self._concurrency}"
+            rprint(line)
+
     def _after_run(self) -> None:
-        self.print_results_per_item()
+        if self._print_after_run:
+            self._print_order()
+            self.print_results_per_item()
+            self.print_profiles()
+
+    def scaling(
+        self,
+        func_name: Union[str, None, List[str]] = None,
+        workers: Optional[List[int]] = None,
+        num_samples: Union[int, List[int], None] = None,
+        backend: str = "processes",
+        num_repeats: Optional[int] = None,
+        chunksize: Union[int, str, None] = None,
+        min_gain: float = 0.5,
+    ) -> List[ScalingReport]:
+        """Run benchmark for every number of `workers` (default - powers of 2 up to cpu count),
+        and every `num_samples` if list given.
+        Return and print throughput, speedup, parallel efficiency, fitted Amdahl serial fraction and knee point -
+        number of workers, after which adding worker gives less than `min_gain` speedup."""
+        max_workers = os.cpu_count() or 1
+        workers = default_workers(max_workers, workers)
+        if backend != "threads":
+            workers = sorted({min(num_workers, max_workers) for num_workers in workers})
+        samples_list = num_samples if isinstance(num_samples, list) else [num_samples]
+        reports = []
+        self._print_after_run = False
+        try:
+            for samples in samples_list:
+                num_items = 0
+                throughputs: Dict[str, List[float]] = defaultdict(list)
+                for num_workers in workers:
+                    self.run(
+                        func_name,
+                        num_repeats=num_repeats,
+                        num_samples=samples,
+                        backend=backend,
+                        num_workers=num_workers,
+                        chunksize=chunksize,
+                    )
+                    for name, result in self.results.items():
+                        num_items = self.items_per_run(name)
+                        throughputs[name].append(num_items / result)
+                for name, values in throughputs.items():
+                    reports.append(scaling_report(name, num_items, workers, values, min_gain))
+        finally:
+            self._print_after_run = True
+        self.print_scaling(reports)
+        return reports
+
+    @staticmethod
+    def print_scaling(reports: List[ScalingReport]) -> None:
+        """Print scaling reports"""
+        for report in reports:
+            rprint(
+                f"{report.func_name}, {report.num_samples} items: "
+                f"serial fraction {report.serial_fraction:0.1%}, knee at {report.knee} workers"
+            )
+            rprint(" Workers | Items/sec | Speedup | Efficiency")
+            for point in report.points:
+                rprint(
+                    f"{point.num_workers:8} | {point.throughput:9.2f} | {point.speedup:7.2f} | {point.efficiency:10.1%}"
+                )
 
     def __call__(
         self,
@@ -334,15 +1667,64 @@ class BenchmarkIter(Benchmark):
         num_samples: Optional[int] = None,
         multiprocessing: Optional[bool] = None,
         num_workers: Optional[int] = None,
+        chunksize: Union[int, str, None] = None,
+        ordered: bool = True,
+        backend: Optional[str] = None,
+        concurrency: int = 1,
+        profile: Union[bool, str, None] = None,
+        profile_dir: Union[str, Path] = "profiles",
+        profile_top: int = 10,
+        precision: Optional[float] = None,
+        min_repeats: int = 5,
+        max_repeats: int = 100,
+        time_budget: Optional[float] = None,
+        shared: Optional[str] = None,
+        trace: Union[bool, str, Path, None] = None,
     ) -> None:
+        """Run benchmark, `backend` - serial, threads, processes or interpreters,
+        `multiprocessing=True` - processes backend, `concurrency` - items in flight for coroutine functions.
+        Items sent to workers by `chunksize` items, "auto" - chunksize tuned for every function,
+        `ordered=False` - use imap_unordered.
+        `shared` - "shm" or "mmap", processes backend: items placed once to shared memory, workers get indices.
+        `trace=True` - record timeline: repeats, items (start, end, worker pid and thread), chunks, at `trace`,
+        path - also save it as Chrome trace-event json. Recording time at parent measured, `trace.overhead_ns`."""
+        if isinstance(chunksize, str) and chunksize != "auto":
+            raise ValueError(f"chunksize should be int or 'auto', got {chunksize!r}")
+        if backend is None:
+            backend = "processes" if multiprocessing else "serial"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, use one of: {', '.join(BACKENDS)}")
+        if backend == "interpreters" and not interpreters_available():
+            raise ValueError("interpreters backend needs concurrent.futures.InterpreterPoolExecutor (python 3.14+)")
+        if shared is not None and shared not in SHARED_KINDS:
+            raise ValueError(f"shared should be one of {', '.join(SHARED_KINDS)}, got {shared!r}")
+        if shared is not None and backend != "processes":
+            raise ValueError("shared items used only with processes backend, threads share memory already")
         self._num_samples = num_samples
-        self._multiprocessing = multiprocessing
+        self._shared_kind = shared
+        self._trace = trace
+        self._backend = backend
+        self._concurrency = concurrency
         self._num_workers = num_workers
+        self._chunksize = chunksize
+        self._ordered = ordered
         super().run(
             func_name=func_name,
             exclude=exclude,
             num_repeats=num_repeats,
+            profile=profile,
+            profile_dir=profile_dir,
+            profile_top=profile_top,
+            precision=precision,
+            min_repeats=min_repeats,
+            max_repeats=max_repeats,
+            time_budget=time_budget,
         )
         self._num_samples = None
-        self._multiprocessing = None
+        self._backend = "serial"
+        self._concurrency = 1
         self._num_workers = None
+        self._chunksize = None
+        self._ordered = True
+        self._shared_kind = None
+        self._trace = None
@@ -0,0 +1,273 @@
+"""Command line runner: discover benchmarks at files or modules, run, write results as json."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import io
+import json
+import re
+import sys
+import traceback
+from contextlib import redirect_stdout
+from fnmatch import fnmatch
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Sequence
+
+from .benchmark import Benchmark, BenchmarkIter
+from .console import escape, rprint
+from .executors import BACKENDS
+from .history import run_info
+from .isolation import get_mp_context
+from .version import cached_version
+
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.connection import Connection
+
+BENCH_FILES = "bench*.py"  # files collected from directory
+BENCH_FUNC_PREFIX = "bench_"
+
+
+class RunOptions(NamedTuple):
+    """Options from command line, passed to `run` of every suite"""
+
+    func: List[str]  # name patterns
+    exclude: List[str]  # name patterns
+    num_repeats: Optional[int] = None
+    num_samples: Optional[int] = None
+    num_workers: Optional[int] = None
+    backend: Optional[str] = None
+
+
+def module_name(path: Path) -> str:
+    """Return name to import file as: file stem, or name from path if stem taken by other file
+    (same file name at other directory) - functions pickled by module name"""
+    names = [path.stem, re.sub(r"\W+", "_", str(path.with_suffix(""))).strip("_")]
+    for name in names:
+        file = getattr(sys.modules.get(name), "__file__", None)
+        if name not in sys.modules or (file is not None and Path(file).resolve() == path.resolve()):
+            return name
+    raise ImportError(f"can't import {path}: module names {', '.join(names)} taken by other files")
+
+
+def load_module(target: str) -> ModuleType:
+    """Import module by file path or dotted name, file's directory added to sys.path for its imports"""
+    path = Path(target)
+    if path.suffix != ".py":
+        return importlib.import_module(target)
+    if not path.is_file():
+        raise FileNotFoundError(f"benchmark file not found: {target}")
+    directory = str(path.resolve().parent)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    name = module_name(path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:  # pragma: no cover
+        raise ImportError(f"can't load {target}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # so functions can be pickled for workers
+    spec.loader.exec_module(module)
+    return module
+
+
+def module_suites(module: ModuleType, label: str) -> Dict[str, Benchmark]:
+    """Return Benchmark objects of module and Benchmark over its `bench_*` functions, by "label:name" """
+    suites: Dict[str, Benchmark] = {}
+    funcs = []
+    for name, value in vars(module).items():
+        if isinstance(value, Benchmark):
+            suites[f"{label}:{name}"] = value
+        elif (
+            name.startswith(BENCH_FUNC_PREFIX)
+            and callable(value)
+            and not isinstance(value, type)
+            and getattr(value, "__module__", None) == module.__name__
+        ):
+            funcs.append(value)
+    if funcs:
+        suites[f"{label}:{BENCH_FUNC_PREFIX}*"] = Benchmark(funcs)
+    return suites
+
+
+def discover(targets: Sequence[str]) -> Dict[str, Benchmark]:
+    """Return suites from targets: benchmark files, directories (bench*.py files) or module names"""
+    suites: Dict[str, Benchmark] = {}
+    for target in targets:
+        path = Path(target)
+        files = sorted(path.rglob(BENCH_FILES)) if path.is_dir() else [path]
+        for file in files:
+            label = str(file) if file.suffix == ".py" else target
+            for name, suite in module_suites(load_module(label), label).items():
+                if all(suite is not found for found in suites.values()):  # same object imported at other module
+                    suites[name] = suite
+    return suites
+
+
+def match(names: Sequence[str], patterns: Sequence[str]) -> List[str]:
+    """Return names matching any of glob patterns"""
+    return [name for name in names if any(fnmatch(name, pattern) for pattern in patterns)]
+
+
+def select_funcs(suite: Benchmark, options: RunOptions) -> Optional[Dict[str, Any]]:
+    """Return `run` kwargs func_name / exclude for suite, None if no function left"""
+    names = list(suite.func_dict)
+    excluded = match(names, options.exclude)
+    if options.func:
+        selected = [name for name in match(names, options.func) if name not in excluded]
+        return {"func_name": selected} if selected else None
+    if len(excluded) == len(names):
+        return None
+    return {"exclude": excluded or None}
+
+
+def suite_record(suite: Benchmark) -> Dict[str, Any]:
+    """Return results of suite as json-able dict: statistics and samples per function"""
+    results = {}
+    for func_name, result in suite.stats.items():
+        record: Dict[str, Any] = {**result.summary(), "samples": list(result.samples)}
+        if isinstance(suite, BenchmarkIter):
+            record["items_per_run"] = suite.items_per_run(func_name)
+            record["exceptions"] = len(suite.exceptions.get(func_name) or ())
+        results[func_name] = record
+    return results
+
+
+def run_suite(suite: Benchmark, options: RunOptions) -> Optional[Dict[str, Any]]:
+    """Run suite with options, return results record, None if nothing selected"""
+    kwargs = select_funcs(suite, options)
+    if kwargs is None:
+        return None
+    if isinstance(suite, BenchmarkIter):
+        backend = options.backend
+        if backend is None and options.num_workers:
+            backend = "processes"
+        suite.run(
+            num_repeats=options.num_repeats,
+            num_samples=options.num_samples,
+            num_workers=options.num_workers,
+            backend=backend,
+            **kwargs,
+        )
+    else:
+        suite.run(num_repeats=options.num_repeats, **kwargs)
+    return suite_record(suite)
+
+
+def _suite_worker(conn: Connection, suite: Benchmark, options: RunOptions) -> None:
+    """Run suite at own process, output captured, send ("done", record, output) or ("error", traceback)"""
+    try:
+        suite.progress = "none"
+        output = io.StringIO()
+        with redirect_stdout(output):
+            record = run_suite(suite, options)
+        conn.send(("done", record, output.getvalue()))
+    except BaseException:  # pylint: disable=broad-except
+        conn.send(("error", traceback.format_exc(), ""))
+    finally:
+        conn.close()
+
+
+def run_serial(suites: Dict[str, Benchmark], options: RunOptions) -> Dict[str, Any]:
+    """Run suites one by one at this process, failed suite does not stop others.
+    Return records (or error tracebacks as str) by suite name."""
+    records: Dict[str, Any] = {}
+    for name, suite in suites.items():
+        rprint(f"[bold]{escape(name)}[/bold]")
+        try:
+            records[name] = run_suite(suite, options)
+        except Exception:  # pylint: disable=broad-except
+            records[name] = traceback.format_exc()
+            rprint(f"[red]{escape(records[name])}[/red]")
+    return records
+
+
+def run_parallel(suites: Dict[str, Benchmark], options: RunOptions, num_parallel: int) -> Dict[str, Any]:
+    """Run every suite at fresh process, up to `num_parallel` at once.
+    Return records (or error tracebacks as str) by suite name, output of suite printed when it done."""
+    from multiprocessing.connection import wait
+
+    ctx = get_mp_context()
+    pending = list(suites.items())
+    running: Dict[Connection, Any] = {}
+    records: Dict[str, Any] = {}
+    while pending or running:
+        while pending and len(running) < num_parallel:
+            name, suite = pending.pop(0)
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_suite_worker, args=(child_conn, suite, options))  # type: ignore
+            process.start()
+            child_conn.close()
+            running[parent_conn] = (name, process)
+        for conn in wait(list(running)):
+            name, process = running.pop(conn)  # type: ignore
+            try:
+                kind, value, output = conn.recv()  # type: ignore
+            except EOFError:
+                kind, value, output = "error", "worker exited w/o results", ""
+            conn.close()  # type: ignore
+            process.join()
+            rprint(f"[bold]{escape(name)}[/bold]")
+            sys.stdout.write(output)
+            if kind == "error":
+                rprint(f"[red]{escape(value)}[/red]")
+            records[name] = value
+    return {name: records[name] for name in suites}
+
+
+class VersionAction(argparse.Action):
+    """Print package version and exit, version resolved only when option given"""
+
+    def __init__(self, option_strings: Sequence[str], dest: str = argparse.SUPPRESS, **kwargs: Any):
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, help="show version and exit")
+
+    def __call__(self, parser: argparse.ArgumentParser, *args: Any, **kwargs: Any) -> None:
+        sys.stdout.write(f"{cached_version()}\n")
+        parser.exit()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="benchmark-utils",
+        description="Run Benchmark / BenchmarkIter objects and bench_* functions found at files or modules.",
+    )
+    parser.add_argument("targets", nargs="+", help="benchmark files, directories (bench*.py files) or module names")
+    parser.add_argument("-k", "--func", action="append", default=[], help="run functions matching glob pattern")
+    parser.add_argument("-e", "--exclude", action="append", default=[], help="skip functions matching glob pattern")
+    parser.add_argument("-r", "--repeats", type=int, help="number of repeats")
+    parser.add_argument("-n", "--samples", type=int, help="BenchmarkIter: number of items to use")
+    parser.add_argument("-w", "--workers", type=int, help="BenchmarkIter: number of workers, processes by default")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, help="BenchmarkIter: backend")
+    parser.add_argument("-p", "--parallel", type=int, default=0, help="run suites at N isolated processes at once")
+    parser.add_argument("--json", type=Path, help="write results to json file")
+    parser.add_argument("--list", action="store_true", help="list suites and functions, don't run")
+    parser.add_argument("--version", action=VersionAction)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of `benchmark-utils` command, return exit code"""
+    args = parse_args(argv)
+    suites = discover(args.targets)
+    if not suites:
+        rprint("No benchmarks found")
+        return 1
+    if args.list:
+        for name, suite in suites.items():
+            rprint(f"{escape(name)}: {escape(', '.join(suite.func_dict))}")
+        return 0
+    options = RunOptions(args.func, args.exclude, args.repeats, args.samples, args.workers, args.backend)
+    if args.parallel:
+        records = run_parallel(suites, options, args.parallel)
+    else:
+        records = run_serial(suites, options)
+    errors = [name for name, record in records.items() if isinstance(record, str)]
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "info": run_info(cached_version()),
+            "suites": {name: record for name, record in records.items() if record is not None},
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return 1 if errors else 0
@@ -0,0 +1,89 @@
+"""Empirical complexity: fit time over input size to O(1), O(log n), O(n), O(n log n), O(n^2)."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+COMPLEXITY_MODELS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n) if n > 1 else 0.0,
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n) if n > 1 else 0.0,
+    "O(n^2)": lambda n: n * n,
+}
+MIN_SIZES = 3  # offset + coef fits 2 sizes exactly
+
+
+class ComplexityFit(NamedTuple):
+    """Fit of time = offset + coef * model(n): offset - constant overhead,
+    relative RMS residual - error to mean time"""
+
+    model: str
+    coef: float
+    residual: float
+    offset: float = 0.0
+
+
+class ParamRow(NamedTuple):
+    """Result for one function and one parameter value, times in sec"""
+
+    func_name: str
+    param: Any
+    size: float
+    mean: float
+    median: float
+    stdev: float
+
+
+class ParamReport(NamedTuple):
+    """Parametrized benchmark: tidy rows and complexity fits per function, best fit first"""
+
+    rows: List[ParamRow]
+    fits: Dict[str, List[ComplexityFit]]
+
+    def best_fit(self, func_name: str) -> ComplexityFit:
+        """Return best fit for function"""
+        return self.fits[func_name][0]
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Return rows as list of dicts, one row per function and parameter"""
+        return [row._asdict() for row in self.rows]
+
+
+def _fit_line(xs: Sequence[float], times: Sequence[float]) -> Tuple[float, float]:
+    """Return least squares offset, coef for time = offset + coef * x, both not negative"""
+    mean_x = math.fsum(xs) / len(xs)
+    mean_time = math.fsum(times) / len(times)
+    coef = math.fsum((x - mean_x) * (y - mean_time) for x, y in zip(xs, times)) / math.fsum(
+        (x - mean_x) ** 2 for x in xs
+    )
+    offset = mean_time - coef * mean_x
+    if coef < 0:  # time not growing with size - constant
+        return mean_time, 0.0
+    if offset < 0:  # no overhead - through origin
+        return 0.0, math.fsum(x * y for x, y in zip(xs, times)) / math.fsum(x * x for x in xs)
+    return offset, coef
+
+
+def fit_complexity(sizes: Sequence[float], times: Sequence[float]) -> List[ComplexityFit]:
+    """Return fits for every model, least squares time = offset + coef * model(n), sorted by residual.
+    Constant overhead goes to offset, O(1) - mean time. Residual corrected for number of fitted
+    parameters, so O(1) wins when other models add nothing. Simpler model wins on equal residuals.
+    Empty list if less than `MIN_SIZES` different sizes."""
+    if len(set(sizes)) < MIN_SIZES:
+        return []
+    mean_time = math.fsum(times) / len(times)
+    fits = []
+    for name, model in COMPLEXITY_MODELS.items():
+        xs = [model(size) for size in sizes]
+        if name == "O(1)":
+            offset, coef, num_params = 0.0, mean_time, 1
+        elif len(set(xs)) < 2:
+            continue
+        else:
+            (offset, coef), num_params = _fit_line(xs, times), 2
+        error = math.fsum((y - offset - coef * x) ** 2 for x, y in zip(xs, times))
+        rms = math.sqrt(error / max(len(times) - num_params, 1))
+        fits.append(ComplexityFit(name, coef, rms / mean_time if mean_time else 0.0, offset))
+    return sorted(fits, key=lambda fit: round(fit.residual, 9))
@@ -0,0 +1,19 @@
+"""Console output with rich, imported on first print, so package import stays fast."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def rprint(*objects: Any, **kwargs: Any) -> None:
+    """rich print"""
+    from rich import print as rich_print
+
+    rich_print(*objects, **kwargs)
+
+
+def escape(markup: str) -> str:
+    """Escape rich markup at text"""
+    from rich.markup import escape as rich_escape
+
+    return rich_escape(markup)
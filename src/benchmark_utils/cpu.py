@@ -0,0 +1,82 @@
+"""CPU time, context switches and page faults per sample, from resource.getrusage."""
+
+from __future__ import annotations
+
+from time import process_time
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+CPU_COLUMNS = ("cpu_util", "user", "sys", "ctx_vol", "ctx_invol", "faults")
+
+RUSAGE_RESOLUTION = 0.01  # sec, cpu time accounted by scheduler ticks, utilization of shorter runs not reliable
+
+Rusage = Tuple[float, float, int, int, int, int]
+
+
+class CpuUsage(NamedTuple):
+    """Resources used by one sample (all loops): sec for times, counts for switches and faults"""
+
+    wall: float
+    user: float
+    sys: float
+    children: float  # cpu time of pool worker processes, not included at user / sys
+    voluntary_switches: int  # waiting on io, locks
+    involuntary_switches: int  # preempted by scheduler
+    minor_faults: int
+    major_faults: int
+
+    @property
+    def cpu(self) -> float:
+        """Total cpu time"""
+        return self.user + self.sys + self.children
+
+    @property
+    def utilization(self) -> Optional[float]:
+        """Cpu time to wall time: below 1 - waiting, above 1 - parallel work.
+        None if wall time less than RUSAGE_RESOLUTION."""
+        return self.cpu / self.wall if self.wall >= RUSAGE_RESOLUTION else None
+
+    def column(self, name: str) -> Optional[float]:
+        """Return value for column from CPU_COLUMNS"""
+        return {
+            "cpu_util": self.utilization,
+            "user": self.user,
+            "sys": self.sys,
+            "ctx_vol": self.voluntary_switches,
+            "ctx_invol": self.involuntary_switches,
+            "faults": self.minor_faults + self.major_faults,
+        }[name]
+
+
+def rusage() -> Rusage:
+    """Return user, sys time, voluntary and involuntary context switches, minor and major page faults
+    for this process and terminated children. Only process time, zero counts, if resource not available."""
+    if resource is None:  # pragma: no cover
+        return process_time(), 0.0, 0, 0, 0, 0
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return (
+        sum(item.ru_utime for item in usage),
+        sum(item.ru_stime for item in usage),
+        sum(item.ru_nvcsw for item in usage),
+        sum(item.ru_nivcsw for item in usage),
+        sum(item.ru_minflt for item in usage),
+        sum(item.ru_majflt for item in usage),
+    )
+
+
+def cpu_usage(before: Rusage, after: Rusage, wall: float, children: float = 0.0) -> CpuUsage:
+    """Return usage between two rusage snapshots"""
+    user, sys, voluntary, involuntary, minor, major = (a - b for a, b in zip(after, before))
+    return CpuUsage(wall, user, sys, children, voluntary, involuntary, minor, major)  # type: ignore
+
+
+def total_usage(usages: Iterable[CpuUsage]) -> Optional[CpuUsage]:
+    """Return sum of usages, None if no usages"""
+    usages = list(usages)
+    if not usages:
+        return None
+    return CpuUsage(*(sum(values) for values in zip(*usages)))  # type: ignore
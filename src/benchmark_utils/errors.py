@@ -0,0 +1,143 @@
+"""Exceptions from items aggregated by type and message: counts, sample items, formatted tracebacks."""
+
+from __future__ import annotations
+
+import random
+import traceback
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+MAX_EXCEPTION_SAMPLES = 5
+MAX_EXCEPTION_KINDS = 100  # distinct type and message per log, others counted per type at OTHER_MESSAGES
+OTHER_MESSAGES = "(other messages)"
+
+_formatted: Dict[str, Dict[Tuple[str, str], int]] = {}  # tracebacks formatted at this process at current run
+
+
+def format_traceback(exception: BaseException) -> str:
+    """Return formatted traceback of exception"""
+    return "".join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+
+
+def exception_info(exception: BaseException, item: Any, local: bool = True, run: str = "") -> Dict[str, Any]:
+    """Return exception type, message and item, traceback not formatted here - it's slow.
+    `local` - info used at same process: live exception kept, traceback formatted only for kept samples.
+    Else (sent from worker process) formatted for first MAX_EXCEPTION_SAMPLES exceptions of type and message
+    at `run` (function and repeat) at process, None for others - no live exception and frames sent."""
+    type_name = type(exception).__name__
+    message = str(exception)
+    if local:
+        return {"type": type_name, "message": message, "item": item, "exception": exception}
+    counts = _formatted.get(run)
+    if counts is None:  # new run, counted from start
+        _formatted.clear()
+        counts = _formatted[run] = {}
+    key = (type_name, message)
+    num_formatted = counts.get(key, 0)
+    formatted = None
+    if num_formatted < MAX_EXCEPTION_SAMPLES and (num_formatted or len(counts) < MAX_EXCEPTION_KINDS):
+        counts[key] = num_formatted + 1
+        formatted = format_traceback(exception)
+    return {"type": type_name, "message": message, "item": item, "traceback": formatted}
+
+
+class ExceptionSummary:
+    """Exceptions of one type and message: count, reservoir of sample items with tracebacks"""
+
+    def __init__(self, type_name: str, message: str, max_samples: int = MAX_EXCEPTION_SAMPLES):
+        self.type_name = type_name
+        self.message = message
+        self.max_samples = max_samples
+        self.count = 0
+        self.samples: List[Tuple[Any, str]] = []  # item, traceback ("" if not sent from worker)
+        self.first_traceback = ""
+
+    def add(self, item: Any, tb: Union[str, BaseException, None], rng: random.Random) -> None:
+        """Count exception, keep item in reservoir (uniform sample of all items).
+        `tb` - formatted traceback or live exception, formatted only if sample kept."""
+        self.count += 1
+        index = len(self.samples) if len(self.samples) < self.max_samples else rng.randrange(self.count)
+        if index >= self.max_samples:
+            return
+        formatted = format_traceback(tb) if isinstance(tb, BaseException) else tb or ""
+        if index == len(self.samples):
+            self.samples.append((item, formatted))
+        else:
+            self.samples[index] = (item, formatted)
+        if not self.first_traceback:
+            self.first_traceback = formatted
+
+    @property
+    def items(self) -> List[Any]:
+        return [item for item, _ in self.samples]
+
+    @property
+    def traceback(self) -> str:
+        """Traceback of first exception with formatted traceback"""
+        return self.first_traceback
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.type_name}: {self.message!r}, count={self.count})"
+
+
+class ExceptionLog:
+    """Exceptions of one function, aggregated by type and message, total time of failed items.
+    Up to `max_kinds` distinct type and message, exceptions with new messages after that counted
+    per type at OTHER_MESSAGES summary. len - number of exceptions."""
+
+    def __init__(self, max_samples: int = MAX_EXCEPTION_SAMPLES, seed: int = 0, max_kinds: int = MAX_EXCEPTION_KINDS):
+        self.max_samples = max_samples
+        self.max_kinds = max_kinds
+        self.summaries: Dict[Tuple[str, str], ExceptionSummary] = {}
+        self.count = 0
+        self.time_ns = 0  # run time of failed items
+        self._rng = random.Random(seed)
+
+    def _summary(self, type_name: str, message: str) -> ExceptionSummary:
+        """Return summary for type and message, new one or OTHER_MESSAGES for type if over max_kinds"""
+        summary = self.summaries.get((type_name, message))
+        if summary is not None:
+            return summary
+        if len(self.summaries) >= self.max_kinds:
+            message = OTHER_MESSAGES
+            summary = self.summaries.get((type_name, message))
+            if summary is not None:
+                return summary
+        summary = self.summaries[(type_name, message)] = ExceptionSummary(type_name, message, self.max_samples)
+        return summary
+
+    def add(self, info: Dict[str, Any], run_time: int = 0) -> None:
+        """Add exception info from `exception_info`, run time of item, ns"""
+        tb = info["exception"] if "exception" in info else info["traceback"]
+        self._summary(info["type"], info["message"]).add(info["item"], tb, self._rng)
+        self.count += 1
+        self.time_ns += run_time
+
+    def merge(self, other: ExceptionLog) -> None:
+        """Add exceptions from other log, samples kept up to max_samples"""
+        for (type_name, message), other_summary in other.summaries.items():
+            summary = self._summary(type_name, message)
+            summary.count += other_summary.count
+            free = self.max_samples - len(summary.samples)
+            summary.samples.extend(other_summary.samples[:free])
+            if not summary.first_traceback:
+                summary.first_traceback = other_summary.first_traceback
+        self.count += other.count
+        self.time_ns += other.time_ns
+
+    def most_common(self, top: Optional[int] = None) -> List[ExceptionSummary]:
+        """Return summaries, most frequent first"""
+        return sorted(self.summaries.values(), key=lambda summary: summary.count, reverse=True)[:top]
+
+    @property
+    def mean_time(self) -> float:
+        """Mean run time of failed item, sec"""
+        return self.time_ns / self.count / 1e9 if self.count else 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[ExceptionSummary]:
+        return iter(self.most_common())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(count={self.count}, kinds={len(self.summaries)})"
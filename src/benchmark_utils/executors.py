@@ -0,0 +1,97 @@
+"""Executor backends for BenchmarkIter: serial, threads, processes, interpreters."""
+
+from __future__ import annotations
+
+import sys
+import sysconfig
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
+    from multiprocessing.pool import Pool
+
+BACKENDS = ("serial", "threads", "processes", "interpreters")
+CHUNKSIZE_BACKENDS = ("threads", "processes")  # send items to workers by chunksize, others - one by one
+
+
+def is_free_threaded() -> bool:
+    """Return True if python is free-threaded build (3.13t+) and GIL is disabled"""
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return False
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or not is_gil_enabled()
+
+
+def interpreters_available() -> bool:
+    """Return True if InterpreterPoolExecutor available (python 3.14+)"""
+    import concurrent.futures
+
+    return hasattr(concurrent.futures, "InterpreterPoolExecutor")
+
+
+class ExecutorPool:
+    """Adapter for concurrent.futures executor to multiprocessing.Pool interface, chunksize ignored.
+    imap and imap_unordered keep up to `in_flight` items submitted, 2 per worker by default."""
+
+    def __init__(self, executor: Executor, num_workers: int = 1, in_flight: Optional[int] = None):
+        self.executor = executor
+        self.in_flight = in_flight or 2 * num_workers
+
+    def imap(self, func: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        from collections import deque
+
+        items = iter(items)
+        futures = deque(self.executor.submit(func, item) for item in islice(items, self.in_flight))
+        while futures:
+            result = futures.popleft().result()
+            for item in islice(items, 1):
+                futures.append(self.executor.submit(func, item))
+            yield result
+
+    def imap_unordered(self, func: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        items = iter(items)
+        pending = {self.executor.submit(func, item) for item in islice(items, self.in_flight)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for item in islice(items, len(done)):
+                pending.add(self.executor.submit(func, item))
+            for future in done:
+                yield future.result()
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> List[Any]:
+        return list(self.executor.map(func, items))
+
+    def close(self) -> None:
+        pass
+
+    def join(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> ExecutorPool:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.join()
+
+
+AnyPool = Union["Pool", ExecutorPool]
+
+
+def create_pool(backend: str, num_workers: int) -> AnyPool:
+    """Return pool of workers for backend, with multiprocessing.Pool interface"""
+    from multiprocessing.pool import Pool, ThreadPool
+
+    if backend == "processes":
+        return Pool(num_workers)
+    if backend == "threads":
+        return ThreadPool(num_workers)
+    if backend == "interpreters":
+        if not interpreters_available():
+            raise ValueError("interpreters backend needs concurrent.futures.InterpreterPoolExecutor (python 3.14+)")
+        from concurrent.futures import InterpreterPoolExecutor  # type: ignore[attr-defined]
+
+        return ExecutorPool(InterpreterPoolExecutor(num_workers), num_workers)
+    raise ValueError(f"Unknown backend {backend!r}, use one of: {', '.join(BACKENDS[1:])}")
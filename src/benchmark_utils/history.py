@@ -0,0 +1,142 @@
+"""Results history - store results as json lines, compare with baseline."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from .stats import BenchmarkResult, mann_whitney_u
+
+
+def git_commit(path: Union[str, Path, None] = None) -> Optional[str]:
+    """Return current git commit hash for path (default - current dir) or None"""
+    import subprocess
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def host_fingerprint() -> str:
+    """Return short hash of host: name, os, machine, processor, cpu count"""
+    import hashlib
+    import platform
+
+    host_info = "|".join(
+        [
+            platform.node(),
+            platform.system(),
+            platform.release(),
+            platform.machine(),
+            platform.processor(),
+            str(os.cpu_count()),
+        ]
+    )
+    return hashlib.sha1(host_info.encode()).hexdigest()[:12]
+
+
+def run_info(version: Optional[str] = None) -> Dict[str, Any]:
+    """Return keys for results: package version, git commit, python version, host fingerprint"""
+    import platform
+
+    return {
+        "version": version,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "host": host_fingerprint(),
+    }
+
+
+class ResultStore:
+    """Results history, stored at file as json lines, one record per function per run"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def save(
+        self,
+        results: Dict[str, BenchmarkResult],
+        version: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Append results to store"""
+        info = run_info(version)
+        timestamp = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for func_name, result in results.items():
+                record = {
+                    "func_name": func_name,
+                    **info,
+                    "tag": tag,
+                    "timestamp": timestamp,
+                    "loops": result.loops,
+                    "samples": list(result.samples),
+                }
+                f.write(json.dumps(record) + "\n")
+
+    def load(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Return records, filtered by keys, for example `host=host_fingerprint()`"""
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if all(record.get(key) == value for key, value in filters.items()):
+                    records.append(record)
+        return records
+
+    def latest(self, **filters: Any) -> Dict[str, BenchmarkResult]:
+        """Return last results per function, filtered by keys"""
+        results = {}
+        for record in self.load(**filters):
+            results[record["func_name"]] = BenchmarkResult(record["samples"], loops=record["loops"])
+        return results
+
+
+class Comparison(NamedTuple):
+    """Comparison of function results with baseline"""
+
+    func_name: str
+    baseline: Optional[float]  # median
+    current: float  # median
+    change: float  # relative change of median
+    p_value: float
+    status: str  # regression, improvement, same or new
+
+
+def compare_results(
+    results: Dict[str, BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    threshold: float = 0.05,
+    alpha: float = 0.05,
+) -> List[Comparison]:
+    """Compare results with baseline.
+    Regression (or improvement) - median changed more than `threshold` and Mann-Whitney U p-value less than `alpha`."""
+    comparisons = []
+    for func_name, result in results.items():
+        if func_name not in baseline:
+            comparisons.append(Comparison(func_name, None, result.median, 0.0, 1.0, "new"))
+            continue
+        base = baseline[func_name]
+        change = result.median / base.median - 1
+        p_value = mann_whitney_u(result.samples, base.samples)
+        status = "same"
+        if p_value < alpha and abs(change) > threshold:
+            status = "regression" if change > 0 else "improvement"
+        comparisons.append(Comparison(func_name, base.median, result.median, change, p_value, status))
+    return comparisons
@@ -0,0 +1,147 @@
+"""Run benchmark in fresh worker processes."""
+
+from __future__ import annotations
+
+import os
+import traceback
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Tuple
+
+from .progress import NullProgress
+from .stats import BenchmarkResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    import multiprocessing.context
+    from multiprocessing.connection import Connection
+
+    from .benchmark import Benchmark, Sample
+
+
+class IsolatedRunError(RuntimeError):
+    """Exception raised in isolated worker, traceback from worker in message"""
+
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """Return multiprocessing context - fork if available, so closures and lambdas can be run"""
+    import multiprocessing
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()  # pragma: no cover
+
+
+def set_affinity(cpus: Optional[List[int]]) -> None:
+    """Pin current process to cpus"""
+    if not cpus:
+        return
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    else:  # pragma: no cover
+        warnings.warn("os.sched_setaffinity not available, cpu_affinity ignored", RuntimeWarning, stacklevel=2)
+
+
+def _worker(
+    conn: Connection,
+    bench: Benchmark,
+    func_name: str,
+    num_repeats: int,
+    number: Optional[int],
+    cpus: Optional[List[int]],
+) -> None:
+    """Run samples for func_name, send results to parent"""
+    from .benchmark import calibrate, iter_samples
+
+    try:
+        set_affinity(cpus)
+        bench.progress_bar = NullProgress()  # type: ignore
+        bench._reset_results()  # pylint: disable=protected-access
+        func = bench._get_func(func_name)  # pylint: disable=protected-access
+        bench._start_pool()  # pylint: disable=protected-access
+        try:
+            if number is None:
+                number = calibrate(func, bench.target_time, bench.disable_gc) if bench.autorange else bench.number
+            for sample in iter_samples(
+                func,
+                num_repeats,
+                number,
+                bench.warmup,
+                bench.disable_gc,
+                bench.children_cpu_time,
+                bench._stop if bench._adaptive else None,  # pylint: disable=protected-access
+                bench._warmup_context(func_name),  # pylint: disable=protected-access
+            ):
+                conn.send(("sample", sample))
+            if bench.memory:
+                bench.memory_results[func_name] = bench.measure_memory(func_name)
+            if bench._profile:  # pylint: disable=protected-access
+                bench.profiles[func_name] = bench.profile_func(func_name)
+        finally:
+            bench._close_pool()  # pylint: disable=protected-access
+        conn.send(("done", bench._isolated_state(func_name)))  # pylint: disable=protected-access
+    except BaseException:  # pylint: disable=broad-except
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _run_process(
+    bench: Benchmark,
+    func_name: str,
+    num_repeats: int,
+    number: Optional[int],
+    cpus: Optional[List[int]],
+) -> Iterator[Tuple[str, Any]]:
+    """Start worker process, yield messages from it: ("sample", Sample), last one ("done", state)"""
+    ctx = get_mp_context()
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(  # type: ignore
+        target=_worker,
+        args=(child_conn, bench, func_name, num_repeats, number, cpus),
+    )
+    process.start()
+    child_conn.close()
+    try:
+        while True:
+            try:
+                kind, value = parent_conn.recv()
+            except EOFError as e:
+                raise IsolatedRunError(f"{func_name}: worker exited with code {process.exitcode}") from e
+            if kind == "error":
+                raise IsolatedRunError(f"{func_name}: exception in worker\n{value}")
+            yield kind, value
+            if kind == "done":
+                break
+    finally:
+        parent_conn.close()
+        process.join()
+
+
+def run_isolated(
+    bench: Benchmark,
+    func_name: str,
+    num_repeats: int,
+    per_repeat: bool = False,
+    cpus: Optional[List[int]] = None,
+    stop: Optional[Callable[[BenchmarkResult], bool]] = None,
+) -> Iterator[Sample]:
+    """Yield samples for func_name, run in fresh process, or process per repeat.
+    Worker state merged to bench after every process.
+    `stop` - adaptive stopping, checked at worker, or between processes for process per repeat."""
+    number = None
+    times = BenchmarkResult()
+    num_processes, repeats = (num_repeats, 1) if per_repeat else (1, num_repeats)
+    for _ in range(num_processes):
+        finished = []  # process per repeat - sample yielded when process done, so it can't overlap next one
+        for kind, value in _run_process(bench, func_name, repeats, number, cpus):
+            if kind == "sample":
+                number = value.loops  # calibrated once, at first process
+                times.append(value.time)
+                if per_repeat:
+                    finished.append(value)
+                else:
+                    yield value
+            else:
+                bench._merge_isolated_state(func_name, value)  # pylint: disable=protected-access
+        yield from finished
+        if per_repeat and stop is not None and stop(times):
+            break
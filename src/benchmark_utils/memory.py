@@ -0,0 +1,109 @@
+"""Memory measurement: tracemalloc peak and net allocations, RSS."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Tuple
+
+MEMORY_COLUMNS = ("mem_peak", "mem_net", "rss_delta", "mem_per_item", "workers_max_rss")
+
+
+class MemoryResult(NamedTuple):
+    """Memory used by one (not timed) run: bytes"""
+
+    peak: int  # tracemalloc peak
+    net: int  # allocated and not freed after run
+    rss_delta: Optional[int]
+    per_item: Optional[float] = None  # tracemalloc peak per item, mean
+    workers_max_rss: Optional[int] = None  # max RSS of worker processes
+
+    def column(self, name: str) -> Optional[float]:
+        """Return value for column from MEMORY_COLUMNS"""
+        return {
+            "mem_peak": self.peak,
+            "mem_net": self.net,
+            "rss_delta": self.rss_delta,
+            "mem_per_item": self.per_item,
+            "workers_max_rss": self.workers_max_rss,
+        }[name]
+
+
+def format_bytes(num_bytes: Optional[float]) -> str:
+    """Return bytes as string with suitable unit"""
+    if num_bytes is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.4g} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.4g} GiB"
+
+
+def _read_proc_status(pid: int, key: str) -> Optional[int]:
+    """Return value in bytes for key (VmRSS, VmHWM) from /proc/<pid>/status, None if not available"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith(f"{key}:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def current_rss() -> Optional[int]:
+    """Return current RSS of this process (Linux), None if not available"""
+    return _read_proc_status(os.getpid(), "VmRSS")
+
+
+def processes_max_rss(pids: Iterable[int]) -> Optional[int]:
+    """Return max of peak RSS of processes (Linux), None if not available"""
+    values = [value for value in (_read_proc_status(pid, "VmHWM") for pid in pids) if value is not None]
+    return max(values) if values else None
+
+
+def trace_memory(func: Callable[[], Any]) -> Tuple[int, int, Optional[int]]:
+    """Run func, return tracemalloc peak, net allocated bytes and RSS delta"""
+    import tracemalloc
+
+    was_tracing = tracemalloc.is_tracing()
+    rss_before = current_rss()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    rss_after = current_rss()
+    rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    return peak - start, current - start, rss_delta
+
+
+def memory_per_item(func: Callable[[Any], Any], items: Iterable[Any]) -> Optional[float]:
+    """Return mean tracemalloc peak per item, exceptions ignored"""
+    import tracemalloc
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    total = 0
+    num_items = 0
+    try:
+        for item in items:
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            try:
+                func(item)
+            except Exception:  # pylint: disable=broad-except
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - start
+            num_items += 1
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return total / num_items if num_items else None
@@ -0,0 +1,49 @@
+"""Profile function run, outside timed runs."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Union
+
+PROFILERS = ("cprofile",)
+
+
+class ProfileEntry(NamedTuple):
+    """Profiled function stats"""
+
+    ncalls: int
+    tottime: float
+    cumtime: float
+    func: str
+
+
+def profile_path(profile_dir: Union[str, Path], func_name: str) -> Path:
+    """Return path for .pstats file, func name cleaned to be used as file name"""
+    file_name = re.sub(r"[^\w.-]+", "_", func_name).strip("_")
+    return Path(profile_dir) / f"{file_name}.pstats"
+
+
+def profile_func(func: Callable[[], Any], path: Union[str, Path]) -> Path:
+    """Run func under cProfile, save stats to path"""
+    import cProfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    profiler.dump_stats(path)
+    return path
+
+
+def top_functions(path: Union[str, Path], top: int = 10, sort: str = "cumulative") -> List[ProfileEntry]:
+    """Return top functions from stats file, sorted by `sort` key"""
+    import pstats
+
+    stats = pstats.Stats(str(path))
+    stats.sort_stats(sort)
+    entries = []
+    for func in stats.fcn_list[:top]:  # type: ignore[attr-defined]
+        _, ncalls, tottime, cumtime, _ = stats.stats[func]  # type: ignore[attr-defined]
+        entries.append(ProfileEntry(ncalls, tottime, cumtime, pstats.func_std_string(func)))
+    return entries
@@ -0,0 +1,70 @@
+"""Progress display helpers: headless progress and batched updates."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, List, Optional, cast
+
+if TYPE_CHECKING:  # pragma: no cover
+    from rich.progress import TaskID
+
+PROGRESS_MODES = ("rich", "batched", "none")
+
+
+class NullProgress:
+    """Progress with rich Progress interface used by benchmarks, renders nothing"""
+
+    def __init__(self) -> None:
+        self.tasks: List[SimpleNamespace] = []
+        self.columns: tuple = ()
+
+    def add_task(self, description: str, total: Optional[float] = None, **kwargs: Any) -> TaskID:
+        self.tasks.append(SimpleNamespace(description=description, total=total, visible=True))
+        return cast("TaskID", len(self.tasks) - 1)
+
+    def update(self, task_id: TaskID, advance: Optional[float] = None, **kwargs: Any) -> None:
+        pass
+
+    def __enter__(self) -> NullProgress:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+class ProgressUpdater:
+    """Advance progress task, update progress not more often than every `interval` seconds"""
+
+    def __init__(self, progress_bar: Any, task: TaskID, interval: float = 0.0):
+        self.progress_bar = progress_bar
+        self.task = task
+        self.interval = interval
+        self.pending = 0
+        self.enabled = not isinstance(progress_bar, NullProgress)
+        self.last_update = perf_counter()
+
+    def advance(self) -> None:
+        if not self.enabled:
+            return
+        self.pending += 1
+        if self.interval:
+            now = perf_counter()
+            if now - self.last_update < self.interval:
+                return
+            self.last_update = now
+        self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.progress_bar.update(self.task, advance=self.pending)
+            self.pending = 0
+
+
+def create_progress(mode: str, columns: List[Any], transient: bool) -> Any:
+    """Return rich Progress or NullProgress for mode `none`"""
+    if mode == "none":
+        return NullProgress()
+    from rich.progress import Progress
+
+    return Progress(*columns, transient=transient)
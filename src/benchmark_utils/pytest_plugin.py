@@ -0,0 +1,184 @@
+"""pytest plugin: `bench` fixture over Benchmark / BenchmarkIter, `bench_utils` marker, time and baseline asserts.
+Benchmark tests - marked or using fixture, skipped with `--bench-skip`, `--bench-only` runs only them.
+Opt-in, not loaded automatically: `pytest -p benchmark_utils.pytest_plugin`
+or `pytest_plugins = ["benchmark_utils.pytest_plugin"]` at root conftest.py."""
+
+from __future__ import annotations
+
+import inspect
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytest
+
+from .benchmark import AnyFunc, Benchmark, BenchmarkIter, format_time
+from .history import Comparison, ResultStore, compare_results, host_fingerprint
+from .stats import BenchmarkResult
+
+MARKER = "bench_utils"  # own name, "benchmark" is used by pytest-benchmark
+FIXTURE = "bench"
+STATS = ("mean", "median", "min", "max", "p95", "p99")
+
+_results_key = pytest.StashKey[Dict[str, BenchmarkResult]]()  # results of session, by test name
+_baseline_key = pytest.StashKey[Optional[Dict[str, BenchmarkResult]]]()  # loaded on first use
+
+
+class BenchFixture:
+    """Run function as benchmark at test, results by test name, assert on last result.
+    Options: defaults (autorange - calibrated loops, headless progress), then marker kwargs, then call kwargs.
+    Marker kwargs not used by Benchmark / BenchmarkIter (as `group`) ignored."""
+
+    def __init__(
+        self,
+        name: str,
+        options: Dict[str, Any],
+        results: Dict[str, BenchmarkResult],
+        baseline: Dict[str, BenchmarkResult],
+    ):
+        self.name = name
+        self.options = {"autorange": True, "progress": "none", **options}
+        self.results = results  # shared by session
+        self.baseline = baseline
+        self.result: Optional[BenchmarkResult] = None
+        self.result_name: Optional[str] = None
+
+    def _result_name(self, name: Optional[str]) -> str:
+        return self.name if name is None else f"{self.name}[{name}]"
+
+    def _run(self, bench: Benchmark, name: Optional[str]) -> BenchmarkResult:
+        bench._print_after_run = False  # pylint: disable=protected-access
+        bench()
+        self.result_name = self._result_name(name)
+        self.result = self.results[self.result_name] = next(iter(bench.stats.values()))
+        return self.result
+
+    def _options(self, bench_class: type, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Return options for class: marker options it accepts, then call kwargs"""
+        params = inspect.signature(bench_class).parameters
+        return {**{key: value for key, value in self.options.items() if key in params}, **kwargs}
+
+    def __call__(self, func: AnyFunc, name: Optional[str] = None, **kwargs: Any) -> BenchmarkResult:
+        """Benchmark func (no args), return result - time per call, sec"""
+        return self._run(Benchmark(func, **self._options(Benchmark, kwargs)), name)
+
+    def iter(
+        self,
+        func: AnyFunc,
+        items: Iterable[Any],
+        name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> BenchmarkResult:
+        """Benchmark func over items, return result - time per run over all items, sec.
+        Options not used by BenchmarkIter (autorange, number, target_time) ignored."""
+        iter_params = inspect.signature(BenchmarkIter).parameters
+        options = {key: value for key, value in self._options(BenchmarkIter, kwargs).items() if key in iter_params}
+        bench = BenchmarkIter(func, item_list=items, **options)  # type: ignore[arg-type]
+        result = self._run(bench, name)
+        for exceptions in bench.exceptions.values():  # failed run not kept at results
+            del self.results[self.result_name]  # type: ignore[arg-type]
+            summary = exceptions.most_common(1)[0]
+            pytest.fail(f"{self.result_name}: {exceptions.count} exceptions, {summary.type_name}: {summary.message}")
+        return result
+
+    def _last(self) -> BenchmarkResult:
+        if self.result is None:
+            raise RuntimeError("no benchmark run yet")
+        return self.result
+
+    def assert_time(self, max_time: float, stat: str = "median") -> None:
+        """Assert last result statistic (median by default) not more than `max_time` sec"""
+        if stat not in STATS:
+            raise ValueError(f"stat should be one of {', '.join(STATS)}, got {stat!r}")
+        value = getattr(self._last(), stat)
+        assert value <= max_time, f"{self.result_name}: {stat} {format_time(value)} > max {format_time(max_time)}"
+
+    def compare(self, max_regression: float = 0.1, alpha: float = 0.05) -> Comparison:
+        """Compare last result with baseline, status "new" if no baseline"""
+        name = self.result_name or ""
+        return compare_results({name: self._last()}, self.baseline, threshold=max_regression, alpha=alpha)[0]
+
+    def assert_baseline(self, max_regression: float = 0.1, alpha: float = 0.05) -> None:
+        """Assert last result median not slower than baseline by more than `max_regression` (0.1 - 10%),
+        change should be significant (Mann-Whitney U p-value < alpha). Passes if no baseline."""
+        comparison = self.compare(max_regression, alpha)
+        assert comparison.status != "regression", (
+            f"{comparison.func_name}: median {format_time(comparison.current)} slower than baseline "
+            f"{format_time(comparison.baseline or 0.0)} by {comparison.change:.1%} > {max_regression:.1%}, "
+            f"p-value {comparison.p_value:.3g}"
+        )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark_utils", "benchmarks with benchmark_utils")
+    group.addoption("--bench-skip", action="store_true", help="skip benchmark tests")
+    group.addoption("--bench-only", action="store_true", help="run only benchmark tests")
+    group.addoption("--bench-store", type=Path, help="results store (json lines), baseline for assert_baseline")
+    group.addoption("--bench-save", action="store_true", help="save results to --bench-store, new baseline")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        f"{MARKER}(**kwargs): benchmark test, kwargs - Benchmark options for `{FIXTURE}` fixture",
+    )
+    if config.getoption("--bench-skip") and config.getoption("--bench-only"):
+        raise pytest.UsageError("--bench-skip and --bench-only can't be used together")
+    if config.getoption("--bench-save") and config.getoption("--bench-store") is None:
+        raise pytest.UsageError("--bench-save needs --bench-store")
+    config.stash[_results_key] = {}
+    config.stash[_baseline_key] = None
+
+
+def is_benchmark(item: pytest.Item) -> bool:
+    """Test is benchmark - marked or uses fixture"""
+    return item.get_closest_marker(MARKER) is not None or FIXTURE in getattr(item, "fixturenames", ())
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    if config.getoption("--bench-skip"):
+        skip = pytest.mark.skip(reason="benchmark, --bench-skip")
+        for item in items:
+            if is_benchmark(item):
+                item.add_marker(skip)
+    elif config.getoption("--bench-only"):
+        deselected = [item for item in items if not is_benchmark(item)]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if is_benchmark(item)]
+
+
+def _baseline(config: pytest.Config) -> Dict[str, BenchmarkResult]:
+    """Latest results for this host from store, loaded once"""
+    baseline = config.stash[_baseline_key]
+    if baseline is None:
+        path = config.getoption("--bench-store")
+        baseline = ResultStore(path).latest(host=host_fingerprint()) if path is not None else {}
+        config.stash[_baseline_key] = baseline
+    return baseline
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> BenchFixture:
+    """Benchmark runner for test, options from `bench_utils` marker"""
+    marker = request.node.get_closest_marker(MARKER)
+    options = dict(marker.kwargs) if marker is not None else {}
+    config = request.config
+    return BenchFixture(request.node.nodeid, options, config.stash[_results_key], _baseline(config))
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    comparisons = {comparison.func_name: comparison for comparison in compare_results(results, _baseline(config))}
+    for name, result in results.items():
+        comparison = comparisons[name]
+        change = "" if comparison.status == "new" else f" | {comparison.change:+.1%} {comparison.status}"
+        terminalreporter.write_line(
+            f"{name}: median {format_time(result.median)}, mean {format_time(result.mean)}, "
+            f"{len(result)} x {result.loops} loops{change}"
+        )
+    if config.getoption("--bench-save"):
+        ResultStore(config.getoption("--bench-store")).save(results, tag="pytest")
+        terminalreporter.write_line(f"results saved to {config.getoption('--bench-store')}")
@@ -0,0 +1,81 @@
+"""Scaling by number of workers: speedup, efficiency, Amdahl serial fraction, knee point."""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Sequence
+
+
+class ScalingPoint(NamedTuple):
+    """Result for one number of workers"""
+
+    num_workers: int
+    throughput: float  # items / sec
+    speedup: float
+    efficiency: float  # speedup / num_workers
+
+
+class ScalingReport(NamedTuple):
+    """Scaling of one function over number of workers, for num_samples items"""
+
+    func_name: str
+    num_samples: int
+    points: List[ScalingPoint]
+    serial_fraction: float
+    knee: int  # number of workers, beyond which adding workers stops paying
+
+
+def scaling_points(workers: Sequence[int], throughputs: Sequence[float]) -> List[ScalingPoint]:
+    """Return points, speedup relative to first point, supposing linear scaling up to it"""
+    base = throughputs[0] / workers[0]
+    points = []
+    for num_workers, throughput in zip(workers, throughputs):
+        speedup = throughput / base
+        points.append(ScalingPoint(num_workers, throughput, speedup, speedup / num_workers))
+    return points
+
+
+def fit_amdahl(workers: Sequence[int], speedups: Sequence[float]) -> float:
+    """Return serial fraction s, least squares fit of 1 / speedup = s + (1 - s) / num_workers"""
+    xs = [1 - 1 / num_workers for num_workers in workers]
+    ys = [1 / speedup - 1 / num_workers for num_workers, speedup in zip(workers, speedups)]
+    denominator = sum(x * x for x in xs)
+    if denominator == 0:
+        return 0.0
+    serial_fraction = sum(x * y for x, y in zip(xs, ys)) / denominator
+    return min(1.0, max(0.0, serial_fraction))
+
+
+def knee_point(points: Sequence[ScalingPoint], min_gain: float = 0.5) -> int:
+    """Return number of workers, after which speedup per added worker less than min_gain"""
+    knee = points[0].num_workers
+    for prev, point in zip(points, points[1:]):
+        added = point.num_workers - prev.num_workers
+        if added <= 0 or (point.speedup - prev.speedup) / added < min_gain:
+            break
+        knee = point.num_workers
+    return knee
+
+
+def scaling_report(
+    func_name: str,
+    num_samples: int,
+    workers: Sequence[int],
+    throughputs: Sequence[float],
+    min_gain: float = 0.5,
+) -> ScalingReport:
+    """Return report for throughputs measured at workers"""
+    points = scaling_points(workers, throughputs)
+    return ScalingReport(
+        func_name,
+        num_samples,
+        points,
+        fit_amdahl(workers, [point.speedup for point in points]),
+        knee_point(points, min_gain),
+    )
+
+
+def default_workers(max_workers: int, workers: Optional[Sequence[int]] = None) -> List[int]:
+    """Return sorted unique worker counts: given, or powers of 2 up to max_workers and max_workers"""
+    if workers is None:
+        workers = [2**i for i in range(max_workers.bit_length()) if 2**i <= max_workers] + [max_workers]
+    return sorted(set(workers))
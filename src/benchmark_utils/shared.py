@@ -0,0 +1,164 @@
+"""Items placed once to shared memory or memory mapped file, workers get views by index."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.shared_memory import SharedMemory
+
+SHARED_KINDS = ("shm", "mmap")
+
+ALIGN = 64  # item offsets aligned, for array views
+_HEADER = struct.Struct("<Q")  # length of pickled item specs, specs and items after it
+
+ItemSpec = Tuple[int, int, Optional[Tuple[str, Tuple[int, ...]]]]  # offset, number of bytes, array dtype and shape
+
+
+def _item_bytes(item: Any) -> Tuple[memoryview, Optional[Tuple[str, Tuple[int, ...]]]]:
+    """Return item bytes and array meta (dtype, shape) for numpy array, None for bytes-like"""
+    if hasattr(item, "__array_interface__") and hasattr(item, "dtype"):
+        import numpy as np
+
+        array = np.ascontiguousarray(item)
+        return memoryview(array).cast("B"), (array.dtype.str, array.shape)
+    try:
+        return memoryview(item).cast("B"), None
+    except TypeError as e:
+        raise TypeError(f"shared items should be bytes-like or numpy arrays, got {type(item).__name__}") from e
+
+
+def _attach_shm(name: str) -> SharedMemory:
+    """Attach to existing shared memory, not tracked - block owned by creating process"""
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+
+    try:
+        return SharedMemory(name, track=False)  # type: ignore[call-arg]  # python 3.13+
+    except TypeError:
+        # tracker inherited by fork is shared with owner - registration there is owner's one, keep it
+        own_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None  # type: ignore[attr-defined]
+        shm = SharedMemory(name)
+        if own_tracker:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+class SharedItems:
+    """Items copied once to shared memory ("shm") or temporary memory mapped file ("mmap").
+    Pickled as reference (kind and name), so workers get only item index, see `shared_item`."""
+
+    def __init__(self, items: Iterable[Any], kind: str = "shm"):
+        if kind not in SHARED_KINDS:
+            raise ValueError(f"kind should be one of {', '.join(SHARED_KINDS)}, got {kind!r}")
+        self.kind = kind
+        specs: List[ItemSpec] = []
+        views = []
+        offset = 0
+        for item in items:
+            view, meta = _item_bytes(item)
+            specs.append((offset, view.nbytes, meta))
+            views.append(view)
+            offset += -(-view.nbytes // ALIGN) * ALIGN
+        header = pickle.dumps(specs)
+        data_start = -(-(_HEADER.size + len(header)) // ALIGN) * ALIGN
+        size = max(data_start + offset, 1)
+        self._shm: Optional[SharedMemory] = None
+        self._file: Optional[str] = None
+        if kind == "shm":
+            from multiprocessing.shared_memory import SharedMemory
+
+            self._shm = SharedMemory(create=True, size=size)
+            self.name = self._shm.name
+            buf = self._shm.buf
+        else:
+            import tempfile
+
+            fd, self._file = tempfile.mkstemp(prefix="benchmark_utils_", suffix=".items")
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+            os.close(fd)
+            self.name = self._file
+            buf = memoryview(self._mmap)
+        buf[: _HEADER.size] = _HEADER.pack(len(header))
+        buf[_HEADER.size : _HEADER.size + len(header)] = header
+        for (item_offset, nbytes, _), view in zip(specs, views):
+            start = data_start + item_offset
+            buf[start : start + nbytes] = view
+            view.release()
+        if kind == "mmap":
+            buf.release()
+        self.num_items = len(specs)
+
+    def __len__(self) -> int:
+        return self.num_items
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return SharedRef, (self.kind, self.name)
+
+    def close(self) -> None:
+        """Free shared memory or remove file"""
+        attached = _attached.pop(self.name, None)
+        if attached is not None:  # items got at this process
+            attached[1].release()
+            attached[0].close()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        if self._file is not None:
+            self._mmap.close()
+            os.remove(self._file)
+            self._file = None
+
+    def __enter__(self) -> SharedItems:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class SharedRef:
+    """Reference to SharedItems, sent to workers"""
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+
+
+_attached: Dict[str, Tuple[Any, memoryview, List[ItemSpec], int]] = {}  # at worker: name -> block, buffer, specs
+
+
+def _attach(ref: Union[SharedRef, SharedItems]) -> Tuple[memoryview, List[ItemSpec], int]:
+    """Return buffer, item specs and data start, attached once per process"""
+    if ref.name not in _attached:
+        if ref.kind == "shm":
+            block: Any = _attach_shm(ref.name)
+            buf = block.buf.toreadonly()
+        else:
+            with open(ref.name, "rb") as f:
+                block = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = memoryview(block)
+        (header_len,) = _HEADER.unpack(buf[: _HEADER.size])
+        specs = pickle.loads(buf[_HEADER.size : _HEADER.size + header_len])
+        data_start = -(-(_HEADER.size + header_len) // ALIGN) * ALIGN
+        _attached[ref.name] = (block, buf, specs, data_start)
+    _, buf, specs, data_start = _attached[ref.name]
+    return buf, specs, data_start
+
+
+def shared_item(ref: Union[SharedRef, SharedItems], index: int) -> Any:
+    """Return item by index, no copy: read only memoryview for bytes-like, numpy array view for arrays"""
+    buf, specs, data_start = _attach(ref)
+    offset, nbytes, meta = specs[index]
+    view = buf[data_start + offset : data_start + offset + nbytes]
+    if meta is None:
+        return view
+    import numpy as np
+
+    dtype, shape = meta
+    return np.frombuffer(view, dtype=dtype).reshape(shape)
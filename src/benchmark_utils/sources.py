@@ -0,0 +1,91 @@
+"""Item sources for BenchmarkIter: sequences, re-iterable objects, factories, files read lazily."""
+
+from __future__ import annotations
+
+import mmap
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Sized, Union
+
+AnySource = Union[Iterable[Any], Callable[[], Iterable[Any]]]
+
+
+class ItemSource:
+    """Items, iterated again for every repeat: sequence, re-iterable object or factory returning iterable.
+    One-shot iterator (generator) not accepted - exhausted after first repeat, pass factory or list.
+    Length - given, len of source if sized, else unknown (None)."""
+
+    def __init__(self, source: AnySource, length: Optional[int] = None):
+        if isinstance(source, Iterator):
+            raise TypeError(
+                f"{type(source).__name__} is one-shot iterator, exhausted after first repeat: "
+                "pass factory returning iterable (generator function, `lambda: gen(...)`) or list"
+            )
+        self.source = source
+        if length is None and isinstance(source, Sized):
+            length = len(source)
+        self.length = length
+
+    def __iter__(self) -> Iterator[Any]:
+        if callable(self.source) and not isinstance(self.source, Iterable):
+            return iter(self.source())
+        return iter(self.source)
+
+    def iter(self, num_samples: Optional[int] = None) -> Iterator[Any]:
+        """Return iterator over first `num_samples` items, all if None"""
+        if num_samples:
+            return islice(iter(self), num_samples)
+        return iter(self)
+
+    def count(self, num_samples: Optional[int] = None) -> Optional[int]:
+        """Return expected number of items for `num_samples`, None if unknown"""
+        if self.length is None:
+            return num_samples or None
+        return min(num_samples, self.length) if num_samples else self.length
+
+
+class FileLines:
+    """Lines of text file without line ends, read lazily, file opened at every iteration"""
+
+    def __init__(self, path: Union[str, Path], encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, encoding=self.encoding) as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+class DirFiles:
+    """Files at directory tree, matched by glob pattern, walked lazily at every iteration"""
+
+    def __init__(self, root: Union[str, Path], pattern: str = "*"):
+        self.root = Path(root)
+        self.pattern = pattern
+
+    def __iter__(self) -> Iterator[Path]:
+        return (path for path in self.root.rglob(self.pattern) if path.is_file())
+
+
+class MmapRecords:
+    """Fixed size records (bytes) of binary file, memory mapped, tail shorter than record skipped"""
+
+    def __init__(self, path: Union[str, Path], record_size: int):
+        if record_size < 1:
+            raise ValueError(f"record_size should be positive, got {record_size}")
+        self.path = Path(path)
+        self.record_size = record_size
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path) // self.record_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        num_records = len(self)
+        if not num_records:  # empty file can't be mapped
+            return
+        size = self.record_size
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, num_records * size, size):
+                yield mapped[offset : offset + size]
@@ -0,0 +1,228 @@
+"""Statistics for benchmark results."""
+
+from __future__ import annotations
+
+import math
+import random
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cpu import CpuUsage, total_usage
+
+STAT_COLUMNS = ("mean", "min", "median", "max", "stdev", "iqr", "p95", "p99", "ci", "outliers")
+
+
+def percentile(sorted_data: List[float], q: float) -> float:
+    """Return q-th percentile (0-100) of sorted data, linear interpolation as numpy default"""
+    if not sorted_data:
+        raise ValueError("percentile of empty data")
+    pos = (len(sorted_data) - 1) * q / 100
+    low = math.floor(pos)
+    high = math.ceil(pos)
+    return sorted_data[low] + (sorted_data[high] - sorted_data[low]) * (pos - low)
+
+
+T_EXACT_MAX_DF = 30  # exact quantile up to, Cornish-Fisher expansion above
+
+
+def _t_central(theta: float, df: int) -> float:
+    """P(|T| < t) for Student t with integer df, t = sqrt(df) * tan(theta), Abramowitz-Stegun 26.7.3-4"""
+    cos2 = math.cos(theta) ** 2
+    term = total = 1.0
+    for k in range(1 + df % 2, df - 2, 2):  # odd df: 2/3, 4/5.., even df: 1/2, 3/4..
+        term *= cos2 * k / (k + 1)
+        total += term
+    if df % 2 == 0:
+        return math.sin(theta) * total
+    tail = math.sin(theta) * math.cos(theta) * total if df > 1 else 0.0
+    return 2 / math.pi * (theta + tail)
+
+
+def t_quantile(confidence: float, df: int) -> float:
+    """Two-sided Student t quantile: exact (bisection on cdf) for df up to T_EXACT_MAX_DF,
+    Cornish-Fisher expansion from normal quantile for bigger df"""
+    if df <= T_EXACT_MAX_DF:
+        low, high = 0.0, math.pi / 2
+        for _ in range(60):
+            mid = (low + high) / 2
+            low, high = (mid, high) if _t_central(mid, df) < confidence else (low, mid)
+        return math.sqrt(df) * math.tan((low + high) / 2)
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    return z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+
+
+class BenchmarkResult:
+    """Results of benchmark for one function: raw samples (sec per call) and statistics on it"""
+
+    def __init__(self, samples: Iterable[float] = (), loops: int = 1):
+        self.samples = array("d", samples)
+        self.loops = loops
+        self.gc_collections: List[Tuple[int, ...]] = []  # per sample, per generation
+        self.cpu: List[CpuUsage] = []  # per sample
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.samples)
+
+    def __getitem__(self, index: int) -> float:
+        return self.samples[index]
+
+    def append(self, sample: float) -> None:
+        """Add sample"""
+        self.samples.append(sample)
+
+    @property
+    def gc_total(self) -> Tuple[int, ...]:
+        """Total number of garbage collections per generation"""
+        return tuple(sum(counts) for counts in zip(*self.gc_collections))
+
+    @property
+    def cpu_total(self) -> Optional[CpuUsage]:
+        """Resources used by all samples, None if not recorded"""
+        return total_usage(self.cpu)
+
+    @property
+    def cpu_utilization(self) -> Optional[float]:
+        """Cpu time to wall time, all samples, None if not recorded"""
+        total = self.cpu_total
+        return total.utilization if total is not None else None
+
+    def _sorted(self) -> List[float]:
+        return sorted(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return math.fsum(self.samples) / len(self.samples)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def max(self) -> float:
+        return max(self.samples)
+
+    @property
+    def median(self) -> float:
+        return percentile(self._sorted(), 50)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, 0 for single sample"""
+        num = len(self.samples)
+        if num < 2:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(math.fsum((x - mean) ** 2 for x in self.samples) / (num - 1))
+
+    def relative_ci_width(self, confidence: float = 0.95) -> float:
+        """Width of confidence interval for mean, relative to mean, Student t (approximation), inf for single sample"""
+        num = len(self.samples)
+        if num < 2:
+            return math.inf
+        mean = self.mean
+        if mean == 0:
+            return 0.0 if self.stdev == 0 else math.inf
+        return 2 * t_quantile(confidence, num - 1) * self.stdev / math.sqrt(num) / abs(mean)
+
+    def percentile(self, q: float) -> float:
+        """Return q-th percentile, q in 0-100"""
+        return percentile(self._sorted(), q)
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range"""
+        data = self._sorted()
+        return percentile(data, 75) - percentile(data, 25)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def ci(self, confidence: float = 0.95, num_resamples: int = 1000, seed: int = 0) -> Tuple[float, float]:
+        """Bootstrap confidence interval for mean"""
+        num = len(self.samples)
+        if num < 2:
+            return self.mean, self.mean
+        rng = random.Random(seed)
+        samples = self.samples
+        means = sorted(math.fsum(rng.choices(samples, k=num)) / num for _ in range(num_resamples))
+        alpha = (1 - confidence) / 2 * 100
+        return percentile(means, alpha), percentile(means, 100 - alpha)
+
+    def outliers_tukey(self, k: float = 1.5) -> int:
+        """Number of samples outside Tukey fences [q1 - k * iqr, q3 + k * iqr]"""
+        data = self._sorted()
+        q1, q3 = percentile(data, 25), percentile(data, 75)
+        low, high = q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+        return sum(1 for x in data if x < low or x > high)
+
+    def outliers_mad(self, threshold: float = 3.5) -> int:
+        """Number of samples with modified z-score (by median absolute deviation) above threshold"""
+        data = self._sorted()
+        median = percentile(data, 50)
+        mad = percentile(sorted(abs(x - median) for x in data), 50)
+        if mad == 0:
+            return sum(1 for x in data if x != median)
+        return sum(1 for x in data if 0.6745 * abs(x - median) / mad > threshold)
+
+    def summary(self) -> Dict[str, float]:
+        """Return dict with main statistics"""
+        ci_low, ci_high = self.ci()
+        return {
+            "mean": self.mean,
+            "min": self.min,
+            "median": self.median,
+            "max": self.max,
+            "stdev": self.stdev,
+            "iqr": self.iqr,
+            "p95": self.p95,
+            "p99": self.p99,
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "outliers_tukey": self.outliers_tukey(),
+            "outliers_mad": self.outliers_mad(),
+            "loops": self.loops,
+            "num_samples": len(self),
+        }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(mean={self.mean:.6g}, samples={len(self)}, loops={self.loops})"
+
+
+def mann_whitney_u(sample_a: Iterable[float], sample_b: Iterable[float]) -> float:
+    """Two-sided p-value of Mann-Whitney U test, normal approximation w/ tie correction"""
+    data_a, data_b = list(sample_a), list(sample_b)
+    len_a, len_b = len(data_a), len(data_b)
+    if not len_a or not len_b:
+        raise ValueError("mann_whitney_u needs non empty samples")
+    combined = sorted([(x, 0) for x in data_a] + [(x, 1) for x in data_b])
+    ranks = [0.0] * len(combined)
+    tie_sum = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        ties = j - i + 1
+        tie_sum += ties**3 - ties
+        i = j + 1
+    rank_sum_a = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_a = rank_sum_a - len_a * (len_a + 1) / 2
+    num = len_a + len_b
+    variance = len_a * len_b / 12 * ((num + 1) - tie_sum / (num * (num - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u_a - len_a * len_b / 2) - 0.5) / math.sqrt(variance)  # continuity correction
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
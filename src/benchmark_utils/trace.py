@@ -0,0 +1,101 @@
+"""Timeline of runs: repeats, items, chunks per worker process, exported as Chrome trace-event json (Perfetto)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+class TraceEvent(NamedTuple):
+    """Complete event, times - perf_counter_ns, same monotonic clock at worker processes"""
+
+    name: str
+    cat: str
+    start: int
+    end: int
+    pid: int
+    tid: int
+    args: Optional[Dict[str, Any]] = None
+
+
+class TraceRecorder:
+    """Trace events of run, `overhead_ns` - time spent on recording at parent process.
+    Events kept as plain tuples - cheaper to record, TraceEvent made on read."""
+
+    def __init__(self) -> None:
+        self._events: List[Tuple[Any, ...]] = []
+        self.process_names: Dict[int, str] = {os.getpid(): "benchmark"}
+        self.thread_names: Dict[Tuple[int, int], str] = {}
+        self.overhead_ns = 0
+
+    def add(
+        self,
+        name: str,
+        cat: str,
+        start: int,
+        end: int,
+        pid: int,
+        tid: int,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._events.append((name, cat, start, end, pid, tid, args))
+
+    @property
+    def events(self) -> List[TraceEvent]:
+        return [TraceEvent._make(event) for event in self._events]
+
+    def count(self, cat: str) -> int:
+        """Number of events of category"""
+        return sum(event[1] == cat for event in self._events)
+
+    def name_thread(self, pid: int, tid: int, name: str) -> None:
+        self.thread_names[(pid, tid)] = name
+
+    def merge(self, other: TraceRecorder) -> None:
+        """Add events from recorder of isolated worker"""
+        self._events.extend(other._events)  # pylint: disable=protected-access
+        for pid, name in other.process_names.items():
+            self.process_names.setdefault(pid, name)
+        self.thread_names.update(other.thread_names)
+        self.overhead_ns += other.overhead_ns
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """Return trace as Chrome trace-event format dict, times in us from first event"""
+        events = self.events
+        origin = min((event.start for event in events), default=0)
+        trace_events: List[Dict[str, Any]] = []
+        for pid in sorted({event.pid for event in events}):
+            name = self.process_names.get(pid, f"worker {pid}")
+            trace_events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        for (pid, tid), name in self.thread_names.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        for event in sorted(events, key=lambda event: (event.start, event.start - event.end)):  # outer first
+            record = {
+                "name": event.name,
+                "cat": event.cat,
+                "ph": "X",
+                "ts": (event.start - origin) / 1000,
+                "dur": (event.end - event.start) / 1000,
+                "pid": event.pid,
+                "tid": event.tid,
+            }
+            if event.args:
+                record["args"] = event.args
+            trace_events.append(record)
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"recording_overhead_ns": self.overhead_ns},
+        }
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write trace json, open at ui.perfetto.dev or chrome://tracing"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome()), encoding="utf-8")
+        return path
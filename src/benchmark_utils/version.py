@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import importlib.util
 import warnings
+from functools import cache
 from pathlib import Path
 
 _VERSION_UNKNOWN = "UNKNOWN"
@@ -104,4 +105,14 @@ def get_version() -> str:
         return _read_version_from_pyproject()
 
 
-__version__ = get_version()  # pragma: no cover
+@cache
+def cached_version() -> str:
+    """Package version, resolved once on first use"""
+    return get_version()
+
+
+def __getattr__(name: str) -> str:
+    """`__version__` resolved lazily, metadata or pyproject.toml read only when asked"""
+    if name == "__version__":
+        return cached_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
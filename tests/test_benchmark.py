@@ -1,15 +1,25 @@
 """tests for benchmarks"""
 
 # pylint: disable=protected-access
+import asyncio
+import gc
+import json
+import os
+import random
 from functools import partial
 from multiprocessing import cpu_count
+from pathlib import Path
 from time import sleep
+from typing import List
 
 import pytest
 from pytest import CaptureFixture
 
-from benchmark_utils import benchmark
+from benchmark_utils import benchmark, sources
 from benchmark_utils.benchmark import get_func_name
+from benchmark_utils.executors import create_pool, interpreters_available, is_free_threaded
+from benchmark_utils.isolation import IsolatedRunError
+from benchmark_utils.profiling import top_functions
 
 
 def func_to_test_1(sleep_time: float = 0.1, mult: int = 1) -> None:
@@ -292,3 +302,739 @@ def test_benchmark_iter_multiprocessing():
     res_mult_1, res_mult_2 = bench.results.values()
     assert res_1 / res_mult_1 > 1.05
     assert res_2 / res_mult_2 > 1.05
+
+
+def test_format_time():
+    """test format_time"""
+    assert benchmark.format_time(1.5) == "1.5 sec"
+    assert benchmark.format_time(0.0123) == "12.3 msec"
+    assert benchmark.format_time(2.5e-6) == "2.5 usec"
+    assert benchmark.format_time(3e-8) == "30 nsec"
+    assert benchmark.format_time(0) == "0 nsec"
+
+
+def test_benchmark_autorange(capsys: CaptureFixture[str]):
+    """test autorange - loops calibrated per func, results per call"""
+    bench = benchmark.Benchmark(
+        {"fast": lambda: None, "slow": lambda: sum(range(1000))},
+        num_repeats=3,
+        autorange=True,
+        target_time=0.01,
+    )
+    bench()
+    assert bench.loops["fast"] > bench.loops["slow"] > 1
+    assert len(bench._results["fast"]) == 3
+    assert bench.results["fast"] < bench.results["slow"] < 0.001
+    out = capsys.readouterr().out
+    assert "Time / call" in out
+    assert "loops" in out
+
+    # fixed number of loops
+    bench = benchmark.Benchmark(lambda: None, num_repeats=2, number=10)
+    bench()
+    assert bench.loops == {"<lambda>": 10}
+    assert len(bench._results["<lambda>"]) == 2
+
+
+def test_benchmark_stats(capsys: CaptureFixture[str]):
+    """test results objects and statistics columns"""
+    bench = benchmark.Benchmark({"func": lambda: sum(range(100))}, num_repeats=10, number=100)
+    bench()
+    result = bench.stats["func"]
+    assert len(result) == 10
+    assert result.loops == 100
+    assert result.mean == bench.results["func"]
+    assert result.min <= result.median <= result.max
+    capsys.readouterr()
+    bench.print_results(columns=["median", "stdev", "p99", "ci", "outliers"])
+    out = capsys.readouterr().out.split("\n")
+    assert "median" in out[0] and "outliers" in out[0]
+    assert out[1].startswith("func")
+    with pytest.raises(ValueError):
+        bench.print_results(columns=["wrong"])
+
+
+def test_benchmark_warmup_gc():
+    """test warmup runs and gc control"""
+    calls = []
+
+    def func():
+        calls.append(1)
+        [[] for _ in range(1000)]  # pylint: disable=expression-not-assigned
+
+    bench = benchmark.Benchmark(func, num_repeats=3, warmup=2)
+    bench()
+    assert len(calls) == 5
+    result = bench.stats["func"]
+    assert len(result) == 3
+    assert len(result.gc_collections) == 3
+    assert sum(result.gc_total) == 0  # gc disabled while timing
+
+    bench = benchmark.Benchmark(func, num_repeats=3, number=100, disable_gc=False)
+    bench()
+    assert sum(bench.stats["func"].gc_total) > 0
+
+    with benchmark.GcCounter() as gc_counter:
+        gc.collect()
+    assert gc_counter.counts[-1] >= 1
+
+
+def test_benchmark_isolate():
+    """test run in isolated processes"""
+    pids = []
+
+    bench = benchmark.Benchmark(
+        {"pid": lambda: pids.append(os.getpid()), "sum": lambda: sum(range(100))},
+        num_repeats=3,
+        isolate=True,
+        cpu_affinity=[0],
+    )
+    bench()
+    assert not pids  # run in child process
+    assert len(bench._results["pid"]) == 3
+    assert len(bench._results["sum"]) == 3
+
+    bench = benchmark.Benchmark(lambda: None, num_repeats=2, isolate="repeat", autorange=True, target_time=0.001)
+    bench()
+    assert len(bench._results["<lambda>"]) == 2
+    assert bench.loops["<lambda>"] > 1
+
+    bench = benchmark.Benchmark(partial(func_with_exception, False), isolate=True)
+    with pytest.raises(IsolatedRunError, match="ValueError"):
+        bench()
+    with pytest.raises(ValueError):
+        benchmark.Benchmark(func_dummy, isolate="wrong")
+
+    # exceptions from BenchmarkIter merged to parent
+    bench = benchmark.BenchmarkIter(
+        func_with_exception, item_list=[True, False, False], isolate="repeat", num_repeats=2
+    )
+    bench()
+    assert len(bench.exceptions["func_with_exception"]) == 4
+    assert len(bench._results["func_with_exception"]) == 2
+
+
+def test_benchmark_iter_isolated_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """isolated run: pool started once at worker process, outside timed runs"""
+    created = tmp_path / "pools"
+
+    def counted_pool(backend: str, num_workers: int):
+        with open(created, "a", encoding="utf-8") as f:  # pool created at worker process
+            f.write(f"{backend}\n")
+        return create_pool(backend, num_workers)
+
+    monkeypatch.setattr(benchmark, "create_pool", counted_pool)
+    bench = benchmark.BenchmarkIter(func_dummy, item_list=list(range(10)), num_repeats=3, isolate=True)
+    bench.run(backend="threads", num_workers=2)
+    assert created.read_text().splitlines() == ["threads"]
+    assert bench.pool_startup_time is not None
+    assert len(bench.item_times["func_dummy"]) == 30
+
+    created.unlink()
+    bench.progress = "none"  # harness overhead measured at parent, with own pool
+    bench.run(backend="threads", num_workers=2)
+    assert created.read_text().splitlines() == ["threads", "threads"]
+    assert bench.harness_overhead is not None
+
+
+def func_fail_odd(item: int) -> None:
+    """raise for odd items, slower than ok ones"""
+    if item % 2:
+        sleep(0.002)
+        raise ValueError(f"odd {item % 4}")
+
+
+def func_fail_odd_copy(item: int) -> None:
+    """same exceptions as func_fail_odd"""
+    func_fail_odd(item)
+
+
+def test_benchmark_exceptions(capsys: CaptureFixture[str]):
+    """exceptions aggregated by type and message, samples capped, failed items time apart"""
+    bench = benchmark.BenchmarkIter(func_fail_odd, item_list=list(range(40)), num_repeats=2, max_exception_samples=2)
+    bench()
+    exceptions = bench.exceptions["func_fail_odd"]
+    assert len(exceptions) == 40
+    assert len(exceptions.summaries) == 2
+    summary = exceptions.most_common(1)[0]
+    assert summary.count == 20
+    assert len(summary.samples) == 2
+    assert "ValueError" in summary.traceback
+    ok_time = bench.ok_item_time("func_fail_odd")
+    assert ok_time is not None
+    assert exceptions.mean_time > ok_time
+    assert "40 exceptions" in capsys.readouterr().out
+
+    bench = benchmark.BenchmarkIter(func_fail_odd, item_list=[1, 3], isolate="repeat", num_repeats=2)
+    bench()
+    assert len(bench.exceptions["func_fail_odd"]) == 4
+    assert bench.ok_item_time("func_fail_odd") is None
+
+
+def test_benchmark_iter_pool(capsys: CaptureFixture[str]):
+    """test pool created once per run, outside timed region"""
+    bench = benchmark.BenchmarkIter(
+        func=[func_to_test_3, func_with_exception],
+        item_list=[True, False, True],
+        num_repeats=2,
+    )
+    bench()
+    assert bench.pool_startup_time is None
+    bench.run(multiprocessing=True, num_workers=2)
+    assert bench.pool_startup_time is not None
+    assert bench._pool is None  # closed after run
+    assert len(bench._results) == 2
+    assert len(bench.exceptions["func_with_exception"]) == 2
+    assert "Pool startup" in capsys.readouterr().out
+
+
+def test_benchmark_iter_chunksize(capsys: CaptureFixture[str]):
+    """test chunksize, auto chunksize and unordered dispatch"""
+    bench = benchmark.BenchmarkIter(
+        func=[func_dummy, func_with_exception],
+        item_list=[True, False] * 20,
+        num_repeats=2,
+    )
+    bench.run(multiprocessing=True, num_workers=2, chunksize=4, ordered=False)
+    assert bench.chunksizes == {"func_dummy": 4, "func_with_exception": 4}
+    assert len(bench.exceptions["func_with_exception"]) == 40
+    out = capsys.readouterr().out
+    assert "chunksize 4" in out
+    assert "unordered" in out
+
+    bench.run(multiprocessing=True, num_workers=2, chunksize="auto")
+    assert bench.chunksizes["func_dummy"] in benchmark.CHUNKSIZE_CANDIDATES
+    assert bench.chunksizes["func_dummy"] <= 20
+    assert "unordered" not in capsys.readouterr().out
+
+    bench.run()
+    assert bench.chunksizes == {}
+    with pytest.raises(ValueError):
+        bench.run(multiprocessing=True, chunksize="wrong")
+
+
+def test_benchmark_iter_backend(capsys: CaptureFixture[str]):
+    """test executor backends"""
+    bench = benchmark.BenchmarkIter(
+        func=[func_to_test_3, func_with_exception],
+        item_list=[True, False] * 4,
+        num_repeats=2,
+    )
+    bench.run(backend="threads", num_workers=8)
+    assert len(bench.exceptions["func_with_exception"]) == 8
+    assert "threads x8" in capsys.readouterr().out
+    res_threads = bench.results["func_to_test_3"]
+    bench.run()
+    assert "serial" in capsys.readouterr().out
+    assert res_threads < bench.results["func_to_test_3"]  # sleep releases GIL
+
+    bench.run(backend="threads", num_workers=2, ordered=False, chunksize=2)
+    assert "threads x2, unordered" in capsys.readouterr().out
+    with pytest.raises(ValueError):
+        bench.run(backend="wrong")
+    if not interpreters_available():
+        with pytest.raises(ValueError):
+            bench.run(backend="interpreters")
+    else:
+        bench.run(backend="interpreters", num_workers=2, chunksize="auto")
+        assert bench.chunksizes == {}  # items sent one by one, no tuning
+    assert isinstance(is_free_threaded(), bool)
+
+
+def test_benchmark_iter_scaling(capsys: CaptureFixture[str]):
+    """test scaling sweep over number of workers"""
+    bench = benchmark.BenchmarkIter(func=func_to_test_3, item_list=list(range(8)), num_repeats=1)
+    reports = bench.scaling(workers=[1, 2, 4], num_samples=[4, 8], backend="threads")
+    assert len(reports) == 2
+    assert [report.num_samples for report in reports] == [4, 8]
+    assert [point.num_workers for point in reports[1].points] == [1, 2, 4]
+    assert reports[1].points[2].speedup > 1.5  # sleep releases GIL
+    out = capsys.readouterr().out
+    assert "knee at" in out
+    assert "Items/sec (" not in out  # results of separate runs not printed
+
+
+async def async_func_to_test(sleep_time: float = 0.01) -> None:
+    """simple async 'sleep' func for test"""
+    await asyncio.sleep(sleep_time)
+
+
+async def async_func_with_exception(in_value: bool) -> None:
+    """dummy async func, return exception."""
+    await asyncio.sleep(0.001)
+    if not in_value:
+        raise ValueError("error")
+
+
+def test_benchmark_async():
+    """test coroutine functions"""
+    bench = benchmark.Benchmark([async_func_to_test, partial(async_func_to_test, 0.02)], num_repeats=3)
+    bench()
+    assert bench.results["async_func_to_test"] == pytest.approx(0.01, abs=0.01)
+    assert bench.results["async_func_to_test(0.02)"] > bench.results["async_func_to_test"]
+    assert bench._loop is None  # closed after run
+    bench = benchmark.Benchmark(async_func_to_test, num_repeats=2, isolate=True)
+    bench()
+    assert len(bench._results["async_func_to_test"]) == 2
+
+
+def test_benchmark_iter_async(capsys: CaptureFixture[str]):
+    """test coroutine functions over items, concurrency"""
+    bench = benchmark.BenchmarkIter(
+        func=[async_func_to_test, async_func_with_exception],
+        item_list=[0.01] * 8,
+        num_repeats=2,
+    )
+    bench()
+    assert len(bench.item_times["async_func_to_test"]) == 16
+    assert min(bench.item_times["async_func_to_test"]) >= 10_000_000
+    assert len(bench.exceptions) == 0
+    assert "latency" in capsys.readouterr().out
+    res_sequential = bench.results["async_func_to_test"]
+    bench.run(concurrency=4)
+    assert bench.results["async_func_to_test"] < res_sequential / 2
+    assert "concurrency 4" in capsys.readouterr().out
+
+    bench = benchmark.BenchmarkIter(func=async_func_with_exception, item_list=[True, False], num_repeats=2)
+    bench.run(concurrency=2)
+    assert len(bench.exceptions["async_func_with_exception"]) == 2
+    with pytest.raises(ValueError):
+        bench.run(backend="threads")
+    bench = benchmark.BenchmarkIter(func=async_func_with_exception, item_list=[True, False], isolate=True)
+    bench()
+    assert len(bench.exceptions["async_func_with_exception"]) == 5
+    assert len(bench.item_times["async_func_with_exception"]) == 10
+
+
+def func_sleep_item(sleep_time: float) -> None:
+    """sleep item seconds"""
+    sleep(sleep_time)
+
+
+def test_benchmark_iter_item_latency(capsys: CaptureFixture[str]):
+    """test latency per item, serial and pool paths"""
+    item_list = [0.001, 0.001, 0.02, 0.001]
+    bench = benchmark.BenchmarkIter(func=func_sleep_item, item_list=item_list, num_repeats=2)
+    for run_kwargs in ({}, {"backend": "threads", "num_workers": 2, "ordered": False}, {"multiprocessing": True}):
+        bench.run(**run_kwargs)
+        assert len(bench.item_times["func_sleep_item"]) == 8
+        assert bench.item_times["func_sleep_item"].typecode == "q"
+        slowest = bench.slowest_items("func_sleep_item", top=2)
+        assert slowest[0][0] == 2
+        assert slowest[0][1] >= 0.02
+        assert len(slowest) == 2
+        latency = bench.item_latency("func_sleep_item")
+        assert latency.max >= 0.02
+        assert latency.median < 0.02
+        out = capsys.readouterr().out
+        assert "p90" in out
+        assert "slowest: #2" in out
+
+
+def test_benchmark_progress_modes(capsys: CaptureFixture[str]):
+    """test headless and batched progress, harness overhead"""
+    bench = benchmark.Benchmark(func_to_test_1, num_repeats=2, progress="none")
+    bench.run()
+    assert len(bench._results["func_to_test_1"]) == 2
+    with pytest.raises(ValueError):
+        benchmark.Benchmark(func_dummy, progress="wrong")
+
+    for progress in ("none", "batched"):
+        bench = benchmark.BenchmarkIter(
+            func=[func_dummy, func_with_exception],
+            item_list=[True, False] * 50,
+            num_repeats=2,
+            progress=progress,
+            progress_interval_ms=10,
+        )
+        bench()
+        assert len(bench.item_times["func_dummy"]) == 200
+        assert len(bench.exceptions["func_with_exception"]) == 100
+        assert 0 < bench.harness_overhead < 0.001
+        assert "_harness_overhead" not in bench.func_dict
+        assert "_harness_overhead" not in bench.item_times
+        assert "Harness overhead" in capsys.readouterr().out
+        bench.run(backend="threads", num_workers=2)
+        assert bench.harness_overhead is not None
+
+    bench = benchmark.BenchmarkIter(func=func_dummy, item_list=[True] * 10)
+    bench()
+    assert bench.harness_overhead is None
+    assert bench.measure_overhead() > 0
+
+
+def func_allocate(size: int = 1_000_000) -> bytes:
+    """allocate bytes"""
+    return bytes(size)
+
+
+def test_benchmark_memory(capsys: CaptureFixture[str]):
+    """test memory measurement next to timing"""
+    bench = benchmark.Benchmark(func_allocate, num_repeats=2, memory=True)
+    bench()
+    memory = bench.memory_results["func_allocate"]
+    assert memory.peak >= 1_000_000
+    assert "peak" in capsys.readouterr().out
+    bench.print_results(columns=["median", "mem_peak", "mem_net", "rss_delta"])
+    assert "976.6 KiB" in capsys.readouterr().out
+
+    bench = benchmark.Benchmark(func_allocate, num_repeats=2, memory=True, isolate=True)
+    bench()
+    assert bench.memory_results["func_allocate"].peak >= 1_000_000
+
+    bench = benchmark.BenchmarkIter(func_allocate, item_list=[1000, 3000], num_repeats=2, memory=True)
+    bench()
+    memory = bench.memory_results["func_allocate"]
+    assert 2000 <= memory.per_item < 3000
+    assert len(bench.item_times["func_allocate"]) == 4  # memory run not recorded
+    assert all(index < 2 for index, _ in bench.slowest_items("func_allocate"))
+    assert "/item" in capsys.readouterr().out
+    bench.run(multiprocessing=True, num_workers=1)
+    memory = bench.memory_results["func_allocate"]
+    assert memory.per_item is None
+    if memory.workers_max_rss is not None:
+        assert "workers max" in capsys.readouterr().out
+
+    bench = benchmark.Benchmark(func_allocate, num_repeats=2)
+    bench()
+    assert bench.memory_results == {}
+
+
+def test_benchmark_profile(tmp_path: Path, capsys: CaptureFixture[str]):
+    """test profiling in separate not timed run"""
+    bench = benchmark.Benchmark(func_allocate, num_repeats=2)
+    bench.run(profile=True, profile_dir=tmp_path, profile_top=3)
+    assert bench.profiles["func_allocate"] == tmp_path / "func_allocate.pstats"
+    assert bench.profiles["func_allocate"].exists()
+    assert len(bench.stats["func_allocate"]) == 2
+    assert "cumtime" in capsys.readouterr().out
+
+    bench = benchmark.BenchmarkIter(func_allocate, item_list=[10, 20, 30], num_repeats=2)
+    bench.run(profile=True, profile_dir=tmp_path)
+    assert len(bench.item_times["func_allocate"]) == 6  # profile run not recorded
+    assert all(index < 3 for index, _ in bench.slowest_items("func_allocate"))
+
+    bench = benchmark.BenchmarkIter(func_allocate, item_list=[10, 20, 30], num_repeats=2)
+    bench.run(backend="threads", num_workers=2, profile=True, profile_dir=tmp_path / "threads", profile_top=20)
+    stats = top_functions(bench.profiles["func_allocate"], top=20)
+    assert any("func_allocate" in entry.func for entry in stats)  # profiled serially, not at workers
+    assert len(bench.item_times["func_allocate"]) == 6
+
+    bench = benchmark.Benchmark(func_allocate, num_repeats=2, isolate=True)
+    bench.run(profile="cprofile", profile_dir=tmp_path / "isolated")
+    assert bench.profiles["func_allocate"].exists()
+
+    bench.run()
+    assert bench.profiles == {}
+    with pytest.raises(ValueError):
+        bench.run(profile="pyinstrument")
+
+
+def func_sleep_short() -> None:
+    """sleep, cpu not used"""
+    sleep(0.01)
+
+
+def test_benchmark_cpu(capsys: CaptureFixture[str]):
+    """test cpu usage per sample: cpu bound and waiting"""
+    bench = benchmark.Benchmark([func_allocate, func_sleep_short], num_repeats=2)
+    bench()
+    assert "cpu" in capsys.readouterr().out
+    assert len(bench.stats["func_allocate"].cpu) == 2
+    assert bench.stats["func_sleep_short"].cpu_utilization < 0.5  # type: ignore
+    bench.print_results(columns=["median", "cpu_util", "user", "sys", "ctx_vol", "ctx_invol", "faults"])
+    assert "ctx_invol" in capsys.readouterr().out
+
+    for sample in benchmark.iter_samples(lambda: None, num_repeats=3):  # timer setup not in cpu window
+        assert sample.cpu is not None
+        assert sample.cpu.wall >= sample.time
+        assert sample.cpu.utilization is None  # shorter than rusage resolution
+
+    bench = benchmark.Benchmark(func_sleep_short, num_repeats=2, isolate=True)
+    bench()
+    assert len(bench.stats["func_sleep_short"].cpu) == 2
+
+    bench = benchmark.BenchmarkIter(func_allocate, item_list=[10_000_000] * 4, num_repeats=2)
+    bench.run(backend="processes", num_workers=1)
+    assert bench.stats["func_allocate"].cpu_total.children > 0  # type: ignore
+    assert bench.children_cpu_time() > 0
+    assert "cpu" in capsys.readouterr().out
+
+
+def func_sum(items: List[int]) -> int:
+    """linear"""
+    return sum(items)
+
+
+def func_pairs(items: List[int]) -> int:
+    """quadratic"""
+    return sum(1 for a in items for b in items if a < b)
+
+
+def test_benchmark_parametrize(capsys: CaptureFixture[str]):
+    """test parametrized sizes, complexity fit"""
+    bench = benchmark.Benchmark([func_sum, func_pairs], num_repeats=3)
+    report = bench.parametrize([200, 400, 800, 1600], setup=lambda n: list(range(n)))
+    assert report.best_fit("func_pairs").model == "O(n^2)"
+    assert len(report.table()) == 8
+    assert {row.size for row in report.rows} == {200, 400, 800, 1600}
+    assert list(bench.func_dict) == ["func_sum", "func_pairs"]
+    out = capsys.readouterr().out
+    assert "O(n^2)" in out
+    assert "Median" in out
+
+    report = bench.parametrize(["a", "bb"], setup=lambda s: [1] * len(s), size=len, func_name="func_sum")
+    assert report.rows[1].size == 2
+    assert list(report.fits) == ["func_sum"]
+    assert report.fits["func_sum"] == []  # 2 sizes - not enough to fit
+
+    with pytest.raises(ValueError):
+        bench.parametrize([object()])
+
+    bench = benchmark.BenchmarkIter(func_allocate, item_list=[1000] * 100, num_repeats=2)
+    report = bench.parametrize([10, 50, 100])
+    assert [row.size for row in report.rows] == [10, 50, 100]
+    report = bench.parametrize([[1000] * 5], backend="threads", num_workers=2)
+    assert report.rows[0].size == 5
+    assert report.fits["func_allocate"] == []
+    assert len(bench.item_list) == 100
+
+
+def test_benchmark_adaptive(capsys: CaptureFixture[str]):
+    """test adaptive stopping: precision, time budget"""
+    bench = benchmark.Benchmark([func_sleep_short, func_to_test_1])
+    bench.run(precision=0.2, min_repeats=3, max_repeats=50)
+    for result in bench.stats.values():
+        assert 3 <= len(result) < 50
+        assert result.relative_ci_width() <= 0.2
+    assert "ci width" in capsys.readouterr().out
+
+    bench.run(precision=1e-9, min_repeats=2, max_repeats=4)
+    assert all(len(result) == 4 for result in bench.stats.values())
+
+    bench.run(time_budget=0.2, min_repeats=2, max_repeats=1000)
+    assert len(bench.stats["func_sleep_short"]) < 20
+    assert len(bench.stats["func_to_test_1"]) == 2
+    capsys.readouterr()
+
+    bench.run()
+    assert all(len(result) == 5 for result in bench.stats.values())
+    assert "ci width" not in capsys.readouterr().out
+
+    for isolate in ("func", "repeat"):
+        bench = benchmark.Benchmark(func_sleep_short, isolate=isolate)
+        bench.run(precision=1e-9, time_budget=0.05, min_repeats=2, max_repeats=100)
+        assert 2 <= len(bench.stats["func_sleep_short"]) < 10
+
+    bench = benchmark.BenchmarkIter(func_to_test_1, item_list=[0.005] * 2)
+    bench.run(precision=1e-9, min_repeats=2, max_repeats=3)
+    assert len(bench.stats["func_to_test_1"]) == 3
+    assert "3 runs" in capsys.readouterr().out
+
+    with pytest.raises(ValueError):
+        bench.run(precision=0.1, min_repeats=5, max_repeats=3)
+
+
+def test_interleave():
+    """test round-robin and random blocks order"""
+    sources = {name: iter(range(num)) for name, num in (("a", 2), ("b", 3))}
+    assert [name for name, _ in benchmark.interleave(sources)] == ["a", "b", "a", "b", "b"]  # type: ignore
+    order = [
+        name
+        for name, _ in benchmark.interleave(
+            {name: iter(range(10)) for name in "abc"},  # type: ignore
+            random.Random(1),
+        )
+    ]
+    assert all(sorted(order[i : i + 3]) == ["a", "b", "c"] for i in range(0, 30, 3))
+    assert order[:9] != ["a", "b", "c"] * 3
+
+
+def test_benchmark_order(capsys: CaptureFixture[str]):
+    """test interleaved and random order"""
+    calls = []
+
+    def func_a():
+        calls.append("a")
+
+    def func_b():
+        calls.append("b")
+
+    bench = benchmark.Benchmark([func_a, func_b], num_repeats=3, order="interleaved")
+    bench()
+    assert calls == ["a", "b"] * 3
+    assert len(bench.stats["func_a"]) == 3
+    assert "interleaved" in capsys.readouterr().out
+
+    calls.clear()
+    bench = benchmark.Benchmark([func_a, func_b], num_repeats=4, order="random", seed=3, memory=True)
+    bench()
+    first = list(calls)
+    assert bench.order_seed == 3
+    assert "seed 3" in capsys.readouterr().out
+    assert set(bench.memory_results) == {"func_a", "func_b"}
+    calls.clear()
+    bench()
+    assert calls == first
+
+    bench = benchmark.Benchmark([func_a, func_b], num_repeats=2, order="random", progress="none")
+    bench.run(precision=1e-9, min_repeats=2, max_repeats=3)
+    assert bench.order_seed is not None
+    assert all(len(result) == 3 for result in bench.stats.values())
+
+    bench = benchmark.Benchmark([func_a, func_b], num_repeats=2, order="interleaved", isolate="repeat")
+    bench()
+    assert all(len(result) == 2 for result in bench.stats.values())
+
+    bench = benchmark.BenchmarkIter([func_to_test_1, func_dummy], item_list=[0.001] * 3, num_repeats=2, order="random")
+    bench.run(backend="threads", num_workers=2)
+    assert all(len(result) == 2 for result in bench.stats.values())
+    assert len(bench.item_times["func_dummy"]) == 6
+
+    with pytest.raises(ValueError):
+        benchmark.Benchmark(func_a, order="reversed")
+    with pytest.raises(ValueError):
+        benchmark.Benchmark(func_a, order="random", isolate=True)
+
+
+def gen_sleep_items():
+    """items from generator"""
+    yield from [0.001] * 4
+
+
+def test_benchmark_iter_sources(tmp_path: Path, capsys: CaptureFixture[str]):
+    """test lazy item sources: factory, unknown length, num_samples by islice"""
+    bench = benchmark.BenchmarkIter(func_to_test_1, item_list=gen_sleep_items, num_repeats=2)
+    bench()
+    assert len(bench.item_times["func_to_test_1"]) == 8
+    assert bench.items_per_run("func_to_test_1") == 4
+    assert "Items/sec" in capsys.readouterr().out
+    bench(num_samples=3)
+    assert bench.items_per_run("func_to_test_1") == 3
+
+    bench.run(backend="threads", num_workers=2, chunksize="auto")
+    assert bench.items_per_run("func_to_test_1") == 4
+
+    bench = benchmark.BenchmarkIter(func_to_test_1, item_list=gen_sleep_items, num_repeats=2, length=10)
+    bench()
+    assert bench.items_per_run("func_to_test_1") == 4
+
+    path = tmp_path / "lines.txt"
+    path.write_text("1\n22\n333\n")
+    bench = benchmark.BenchmarkIter(len, item_list=sources.FileLines(path), num_repeats=2, memory=True)
+    bench.run(profile=True, profile_dir=tmp_path)
+    assert bench.items_per_run("len") == 3
+    assert len(bench.item_times["len"]) == 6
+
+    bench = benchmark.BenchmarkIter(func_sleep_item, item_list=lambda: (0.001 for _ in range(3)), num_repeats=2)
+    bench()
+    assert bench.items_per_run("func_sleep_item") == 3
+    with pytest.raises(TypeError):
+        benchmark.BenchmarkIter(func_sleep_item, item_list=(0.001 for _ in range(3)))
+
+
+def func_sum_bytes(item: bytes) -> int:
+    """sum of bytes, fails on empty"""
+    if not item:
+        raise ValueError("empty")
+    return sum(item)
+
+
+def test_benchmark_iter_shared(capsys: CaptureFixture[str]):
+    """test items at shared memory / mmap file, processes backend"""
+    items = [bytes(range(256)) * 4] * 7 + [b""]
+    bench = benchmark.BenchmarkIter(func_sum_bytes, item_list=items, num_repeats=2)
+    for kind in ("shm", "mmap"):
+        bench.run(backend="processes", num_workers=2, shared=kind, chunksize="auto")
+        assert bench.items_per_run("func_sum_bytes") == 8
+        assert bench.shared_setup_time is not None
+        assert len(bench.exceptions["func_sum_bytes"]) == 2
+        assert bench.exceptions["func_sum_bytes"].most_common()[0].items[0] == "shared item 7"
+        assert "Shared items" in capsys.readouterr().out
+    assert bench._shared is None
+
+    bench.run(backend="processes", num_workers=1, shared="shm", num_samples=3)
+    assert bench.items_per_run("func_sum_bytes") == 3
+    assert not bench.exceptions
+
+    bench_isolated = benchmark.BenchmarkIter(func_sum_bytes, item_list=items, num_repeats=2, isolate=True)
+    bench_isolated.run(backend="processes", num_workers=1, shared="shm")
+    assert bench_isolated.items_per_run("func_sum_bytes") == 8
+
+    bench.run()
+    assert bench.shared_setup_time is None
+    with pytest.raises(ValueError):
+        bench.run(shared="shm")
+    with pytest.raises(ValueError):
+        bench.run(backend="processes", shared="queue")
+
+
+def test_benchmark_iter_trace(tmp_path: Path, capsys: CaptureFixture[str]):
+    """timeline of repeats, items, chunks, worker pids, saved as trace-event json"""
+    bench = benchmark.BenchmarkIter(func_fail_odd, item_list=list(range(8)), num_repeats=2, progress="none")
+    bench.run(trace=True)
+    assert bench.trace is not None
+    assert bench.trace.count("repeat") == 2
+    assert bench.trace.count("item") == 16  # not measure_overhead items
+    item = next(event for event in bench.trace.events if event.cat == "item" and event.args["index"] == 1)
+    assert item.args["error"] == "ValueError"
+    assert item.pid == os.getpid()
+    assert bench.trace.overhead_ns > 0
+    assert "Trace: 18 events" in capsys.readouterr().out
+
+    path = tmp_path / "trace.json"
+    bench.run(backend="processes", num_workers=2, chunksize=4, trace=path)
+    assert bench.trace_path == path
+    events = json.loads(path.read_text())["traceEvents"]
+    items = [event for event in events if event.get("cat") == "item"]
+    assert len(items) == 16
+    assert {event["pid"] for event in items} - {os.getpid()} == {event["pid"] for event in items}
+    assert sum(event.get("cat") == "chunk" for event in events) == 4
+    assert any(event["ph"] == "M" and event["args"]["name"].startswith("worker") for event in events)
+
+    bench = benchmark.BenchmarkIter(func_fail_odd, item_list=[1, 2], isolate="repeat", num_repeats=2)
+    bench.run(trace=True)
+    assert bench.trace is not None
+    assert bench.trace.count("repeat") == 2
+    assert len({event.pid for event in bench.trace.events}) == 2  # process per repeat
+
+    bench = benchmark.BenchmarkIter(async_func_to_test, item_list=[0.001] * 4, num_repeats=1)
+    bench.run(trace=True, concurrency=2)
+    assert bench.trace is not None
+    assert {event.tid for event in bench.trace.events if event.cat == "item"} == {1, 2}
+    bench()
+    assert bench.trace is None
+
+
+def test_benchmark_iter_warmup_not_recorded():
+    """warmup runs not added to item latency, exceptions and trace"""
+    for isolate in (False, True):
+        bench = benchmark.BenchmarkIter(
+            func_with_exception, item_list=[True, False, False], num_repeats=2, warmup=3, isolate=isolate
+        )
+        bench.run(trace=True)
+        assert len(bench.item_times["func_with_exception"]) == 6
+        assert len(bench.exceptions["func_with_exception"]) == 4
+        assert bench.trace is not None
+        assert bench.trace.count("repeat") == 2
+        assert bench.trace.count("item") == 6
+
+
+def test_benchmark_iter_items_per_run_warmup():
+    """items per run counted at timed repeats, warmup excluded"""
+    bench = benchmark.BenchmarkIter(len, item_list=[[1]] * 100, num_repeats=3, warmup=2)
+    bench()
+    assert bench.items_per_run("len") == 100
+    bench.run(backend="threads", num_workers=2)
+    assert bench.items_per_run("len") == 100
+    assert len(bench.item_times["len"]) == 300
+
+
+def test_benchmark_exceptions_tracebacks_per_run():
+    """worker tracebacks counted per function and repeat, same exceptions at next function get own"""
+    bench = benchmark.BenchmarkIter([func_fail_odd, func_fail_odd_copy], item_list=list(range(8)), num_repeats=2)
+    bench.run(backend="processes", num_workers=1)
+    for func_name in ("func_fail_odd", "func_fail_odd_copy"):
+        samples = [sample for summary in bench.exceptions[func_name].summaries.values() for sample in summary.samples]
+        assert len(samples) == 8
+        assert all("ValueError" in tb for _, tb in samples)
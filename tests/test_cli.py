@@ -0,0 +1,148 @@
+"""tests for command line runner"""
+
+import json
+from pathlib import Path
+
+import pytest
+from pytest import CaptureFixture
+
+from benchmark_utils import Benchmark, cli
+from benchmark_utils.cli import RunOptions, discover, main, parse_args, select_funcs
+
+BENCH_FILE = """
+from time import sleep
+
+from benchmark_utils import Benchmark, BenchmarkIter
+
+
+def func_a():
+    sleep(0.001)
+
+
+def func_b():
+    sleep(0.002)
+
+
+def func_item(item):
+    if item < 0:
+        raise ValueError("negative")
+
+
+def bench_sum():
+    sum(range(100))
+
+
+bench = Benchmark([func_a, func_b], num_repeats=3)
+bench_items = BenchmarkIter(func_item, item_list=[1, 2, -1, 3], num_repeats=2)
+"""
+
+
+@pytest.fixture
+def bench_dir(tmp_path: Path) -> Path:
+    """directory w/ benchmark file"""
+    (tmp_path / "bench_example.py").write_text(BENCH_FILE)
+    (tmp_path / "helpers.py").write_text("def bench_not_collected():\n    pass\n")
+    return tmp_path
+
+
+def test_discover(bench_dir: Path):
+    """suites from Benchmark objects and bench_* functions"""
+    suites = discover([str(bench_dir)])
+    names = sorted(name.rsplit(":", 1)[1] for name in suites)
+    assert names == ["bench", "bench_*", "bench_items"]
+    func_suite = next(suite for name, suite in suites.items() if name.endswith("bench_*"))
+    assert list(func_suite.func_dict) == ["bench_sum"]
+    with pytest.raises(FileNotFoundError):
+        discover([str(bench_dir / "missing.py")])
+
+
+def test_select_funcs():
+    """glob patterns to run kwargs"""
+    suite = Benchmark({"sort_a": print, "sort_b": print, "find": print})
+    assert select_funcs(suite, RunOptions(["sort_*"], [])) == {"func_name": ["sort_a", "sort_b"]}
+    assert select_funcs(suite, RunOptions(["sort_*"], ["*_b"])) == {"func_name": ["sort_a"]}
+    assert select_funcs(suite, RunOptions([], ["find"])) == {"exclude": ["find"]}
+    assert select_funcs(suite, RunOptions([], [])) == {"exclude": None}
+    assert select_funcs(suite, RunOptions(["missing"], [])) is None
+    assert select_funcs(suite, RunOptions([], ["*"])) is None
+
+
+def test_main(bench_dir: Path, capsys: CaptureFixture[str]):
+    """run, filter, json output, list"""
+    target = str(bench_dir / "bench_example.py")
+    json_path = bench_dir / "out" / "results.json"
+    assert main([target, "-r", "2", "-n", "3", "-e", "func_b", "--json", str(json_path)]) == 0
+    data = json.loads(json_path.read_text())
+    assert data["info"]["version"]
+    suites = data["suites"]
+    assert list(suites[f"{target}:bench"]) == ["func_a"]
+    assert suites[f"{target}:bench"]["func_a"]["num_samples"] == 2
+    assert len(suites[f"{target}:bench"]["func_a"]["samples"]) == 2
+    items = suites[f"{target}:bench_items"]["func_item"]
+    assert items["items_per_run"] == 3
+    assert items["exceptions"] == 2
+    assert "bench_sum" in suites[f"{target}:bench_*"]
+
+    assert main([target, "-k", "func_a", "-r", "2", "--json", str(json_path)]) == 0
+    assert list(json.loads(json_path.read_text())["suites"]) == [f"{target}:bench"]
+
+    assert main([target, "--list"]) == 0
+    assert "func_a, func_b" in capsys.readouterr().out
+    (bench_dir / "empty.py").write_text("")
+    assert main([str(bench_dir / "empty.py")]) == 1
+
+
+def test_main_parallel(bench_dir: Path, capsys: CaptureFixture[str]):
+    """suites at isolated processes, output collected"""
+    target = str(bench_dir / "bench_example.py")
+    json_path = bench_dir / "results.json"
+    assert main([target, "-r", "2", "-p", "2", "--json", str(json_path)]) == 0
+    suites = json.loads(json_path.read_text())["suites"]
+    assert len(suites) == 3
+    assert len(suites[f"{target}:bench"]["func_b"]["samples"]) == 2
+    assert suites[f"{target}:bench_items"]["func_item"]["exceptions"] == 2
+    out = capsys.readouterr().out
+    assert "func_a" in out
+    assert "bench_items" in out
+
+
+def test_main_errors(bench_dir: Path, capsys: CaptureFixture[str]):
+    """failed suite recorded as traceback, others run, exit code 1"""
+    (bench_dir / "bench_broken.py").write_text("def bench_fail():\n    raise RuntimeError('broken')\n")
+    json_path = bench_dir / "results.json"
+    assert main([str(bench_dir), "-r", "2", "--json", str(json_path)]) == 1
+    suites = json.loads(json_path.read_text())["suites"]
+    assert len(suites) == 4
+    broken = next(record for name, record in suites.items() if "bench_broken" in name)
+    assert "RuntimeError: broken" in broken
+    assert len(suites[f"{bench_dir / 'bench_example.py'}:bench"]["func_a"]["samples"]) == 2
+    assert "RuntimeError" in capsys.readouterr().out
+
+
+def test_main_same_file_names(tmp_path: Path):
+    """same file name at other directories - imported as other modules, functions pickled for workers"""
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "bench_same.py").write_text(
+            f"from benchmark_utils import BenchmarkIter\n\n\ndef func_{name}(item):\n    pass\n\n\n"
+            f"bench = BenchmarkIter(func_{name}, item_list=[1, 2, 3], num_repeats=2)\n"
+        )
+    suites = discover([str(tmp_path)])
+    assert len(suites) == 2
+    assert len({suite.func_dict[name].__module__ for suite in suites.values() for name in suite.func_dict}) == 2
+    json_path = tmp_path / "results.json"
+    assert main([str(tmp_path), "-w", "2", "--json", str(json_path)]) == 0
+    assert len(json.loads(json_path.read_text())["suites"]) == 2
+
+
+def test_version_lazy(monkeypatch: pytest.MonkeyPatch, capsys: CaptureFixture[str]):
+    """version resolved only for --version"""
+    calls = []
+    monkeypatch.setattr(cli, "cached_version", lambda: calls.append(1) or "1.2.3")
+    assert parse_args(["bench.py"]).targets == ["bench.py"]
+    assert not calls
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(["--version"])
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == "1.2.3\n"
+    assert calls == [1]
@@ -0,0 +1,47 @@
+"""tests for complexity fit"""
+
+import math
+
+from benchmark_utils.complexity import ComplexityFit, ParamReport, ParamRow, fit_complexity
+
+SIZES = [100, 200, 400, 800, 1600]
+
+
+def test_fit_complexity():
+    """best fit for synthetic times"""
+    assert fit_complexity(SIZES, [1e-3] * 5)[0].model == "O(1)"
+    assert fit_complexity(SIZES, [2e-6 * n for n in SIZES])[0].model == "O(n)"
+    assert fit_complexity(SIZES, [1e-6 * n * math.log(n) for n in SIZES])[0].model == "O(n log n)"
+    fits = fit_complexity(SIZES, [1e-9 * n * n for n in SIZES])
+    assert fits[0].model == "O(n^2)"
+    assert fits[0].coef == 1e-9 or abs(fits[0].coef - 1e-9) < 1e-15
+    assert fits[0].residual < 1e-9
+    assert len(fits) == 5
+    assert fits[1].residual > 0
+    assert fit_complexity([100, 100], [1.0, 1.1]) == []
+    assert fit_complexity([10, 100], [1.0, 5.0]) == []  # any line fits 2 sizes exactly
+    assert fit_complexity([10, 100, 100], [1.0, 5.0, 5.1]) == []
+
+
+def test_fit_complexity_offset():
+    """constant overhead goes to offset, not to flatter model"""
+    fits = fit_complexity(SIZES, [5e-4 + 1e-8 * n for n in SIZES])
+    assert fits[0].model == "O(n)"
+    assert abs(fits[0].offset - 5e-4) < 1e-12
+    assert abs(fits[0].coef - 1e-8) < 1e-15
+    assert fit_complexity(SIZES, [1e-3 + 1e-9 * n * n for n in SIZES])[0].model == "O(n^2)"
+    assert fit_complexity(SIZES, [1e-3 + 1e-6 * n * math.log(n) for n in SIZES])[0].model == "O(n log n)"
+    fits = fit_complexity(SIZES, [1e-3, 1.1e-3, 0.9e-3, 1.05e-3, 1e-3])  # noise, no growth
+    assert fits[0].model == "O(1)"
+    assert fits[0].offset == 0.0
+
+
+def test_param_report():
+    """tidy table, best fit"""
+    rows = [ParamRow("func", n, n, n * 1e-6, n * 1e-6, 0.0) for n in SIZES]
+    report = ParamReport(rows, {"func": [ComplexityFit("O(n)", 1e-6, 0.0)]})
+    assert report.best_fit("func").model == "O(n)"
+    table = report.table()
+    assert len(table) == 5
+    assert table[0]["func_name"] == "func"
+    assert table[0]["size"] == 100
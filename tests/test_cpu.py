@@ -0,0 +1,30 @@
+"""tests for cpu usage"""
+
+from benchmark_utils.cpu import CpuUsage, cpu_usage, rusage, total_usage
+
+
+def test_rusage():
+    """rusage snapshots, delta for cpu work"""
+    before = rusage()
+    sum(range(1_000_000))
+    usage = cpu_usage(before, rusage(), wall=0.1, children=0.05)
+    assert usage.user + usage.sys > 0
+    assert usage.children == 0.05
+    assert usage.cpu == usage.user + usage.sys + 0.05
+    assert usage.voluntary_switches >= 0
+
+
+def test_cpu_usage():
+    """utilization, columns, total"""
+    usage = CpuUsage(2.0, 0.5, 0.25, 0.25, 3, 1, 10, 0)
+    assert usage.utilization == 0.5
+    assert usage.column("cpu_util") == 0.5
+    assert usage.column("faults") == 10
+    assert CpuUsage(0.0, 0, 0, 0, 0, 0, 0, 0).utilization is None
+    assert CpuUsage(0.001, 0.004, 0, 0, 0, 0, 0, 0).utilization is None  # shorter than rusage resolution
+    total = total_usage([usage, usage])
+    assert total is not None
+    assert total.wall == 4.0
+    assert total.voluntary_switches == 6
+    assert total.utilization == 0.5
+    assert total_usage([]) is None
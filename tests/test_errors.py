@@ -0,0 +1,103 @@
+"""tests for exceptions aggregation"""
+
+from benchmark_utils import errors
+from benchmark_utils.errors import (
+    MAX_EXCEPTION_SAMPLES,
+    OTHER_MESSAGES,
+    ExceptionLog,
+    exception_info,
+    format_traceback,
+)
+
+
+def fail(value: int) -> None:
+    """raise for odd values"""
+    if value % 2:
+        raise ValueError(f"odd {value % 4}")
+    raise KeyError(value)
+
+
+def info(value: int):
+    """exception info for value"""
+    try:
+        fail(value)
+    except Exception as e:  # pylint: disable=broad-except
+        return exception_info(e, value)
+    return None
+
+
+def test_exception_info():
+    """type and message, live exception kept at same process, traceback formatted at worker process"""
+    result = info(1)
+    assert result is not None
+    assert result["type"] == "ValueError"
+    assert result["message"] == "odd 1"
+    assert result["item"] == 1
+    assert isinstance(result["exception"], ValueError)
+    assert "traceback" not in result
+    assert "in fail" in format_traceback(result["exception"])
+
+    results = [exception_info(ValueError("worker"), value, local=False, run="a") for value in range(10)]
+    assert "exception" not in results[0]
+    assert [result["traceback"] is not None for result in results] == [True] * MAX_EXCEPTION_SAMPLES + [False] * 5
+    results = [exception_info(ValueError("worker"), value, local=False, run="b") for value in range(10)]
+    assert sum(result["traceback"] is not None for result in results) == MAX_EXCEPTION_SAMPLES  # counted per run
+    assert list(errors._formatted) == ["b"]  # pylint: disable=protected-access
+
+
+def test_exception_log():
+    """aggregated by type and message, samples capped, merge"""
+    log = ExceptionLog(max_samples=3)
+    assert not log
+    for value in range(100):
+        log.add(info(value), run_time=10)
+    assert len(log) == 100
+    assert log.time_ns == 1000
+    assert log.mean_time == 10 / 1e9
+    assert len(log.summaries) == 52  # KeyError per even value, 2 ValueError messages
+    top = log.most_common(2)
+    assert [summary.count for summary in top] == [25, 25]
+    assert {summary.message for summary in top} == {"odd 1", "odd 3"}
+    assert all(len(summary.samples) == 3 for summary in top)
+    assert all(item % 4 == 1 for item in log.summaries[("ValueError", "odd 1")].items)
+    assert "ValueError" in top[0].traceback
+
+    other = ExceptionLog(max_samples=3)
+    other.add(info(1), run_time=5)
+    other.add(info(5), run_time=5)
+    log.merge(other)
+    assert log.count == 102
+    assert log.time_ns == 1010
+    assert log.summaries[("ValueError", "odd 1")].count == 27
+    assert len(log.summaries[("ValueError", "odd 1")].samples) == 3
+    assert list(log)[0].count == 27
+    assert ExceptionLog().mean_time == 0.0
+
+
+def test_exception_log_bounded(monkeypatch):
+    """distinct messages capped, traceback formatted only for kept samples"""
+    num_formatted = 0
+
+    def counted(exception):
+        nonlocal num_formatted
+        num_formatted += 1
+        return format_traceback(exception)
+
+    monkeypatch.setattr(errors, "format_traceback", counted)
+    log = ExceptionLog(max_samples=2, max_kinds=10)
+    for value in range(10_000):
+        log.add(info(value))
+    assert len(log) == 10_000
+    assert len(log.summaries) == 11  # 8 KeyError, 2 ValueError messages, other KeyError messages
+    other = log.summaries[("KeyError", OTHER_MESSAGES)]
+    assert other.count == 5000 - 8
+    assert len(other.samples) == 2
+    assert "in fail" in other.traceback
+    assert num_formatted < 200  # reservoir replacements only, not per exception
+
+    worker = ExceptionLog(max_samples=2)
+    worker.add({"type": "KeyError", "message": "1", "item": 1, "traceback": None})
+    worker.add({"type": "KeyError", "message": "1", "item": 3, "traceback": "Traceback"})
+    summary = worker.summaries[("KeyError", "1")]
+    assert summary.samples == [(1, ""), (3, "Traceback")]
+    assert summary.traceback == "Traceback"
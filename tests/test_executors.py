@@ -0,0 +1,46 @@
+"""tests for executors"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+import pytest
+
+from benchmark_utils.executors import ExecutorPool, create_pool
+
+
+def test_executor_pool():
+    """adapter over concurrent.futures executor"""
+    with ExecutorPool(ThreadPoolExecutor(2)) as pool:
+        assert list(pool.imap(abs, [-1, -2, -3], chunksize=2)) == [1, 2, 3]
+        assert sorted(pool.imap_unordered(abs, [-1, -2, -3])) == [1, 2, 3]
+        assert pool.map(abs, [-4]) == [4]
+
+
+def test_executor_pool_in_flight():
+    """items submitted by bounded window, not all at once"""
+    taken = []
+
+    def items():
+        for item in count():
+            taken.append(item)
+            yield item
+
+    with ExecutorPool(ThreadPoolExecutor(2), num_workers=2) as pool:
+        assert pool.in_flight == 4
+        assert next(pool.imap(abs, items())) == 0
+        assert len(taken) <= 5
+        taken.clear()
+        next(pool.imap_unordered(abs, items()))
+        assert len(taken) <= 8  # done ones replaced by new items
+        assert sorted(pool.imap_unordered(abs, range(-10, 0))) == list(range(1, 11))
+        assert list(pool.imap(abs, range(-10, 0))) == list(range(10, 0, -1))
+
+
+def test_create_pool():
+    """pools for backends"""
+    with create_pool("threads", 2) as pool:
+        assert pool.map(abs, [-1, -2]) == [1, 2]
+    with create_pool("processes", 1) as pool:
+        assert pool.map(abs, [-1, -2]) == [1, 2]
+    with pytest.raises(ValueError):
+        create_pool("serial", 1)
@@ -0,0 +1,86 @@
+"""tests for results history"""
+
+import json
+
+from benchmark_utils import benchmark
+from benchmark_utils.history import ResultStore, compare_results, git_commit, host_fingerprint, run_info
+from benchmark_utils.stats import BenchmarkResult
+from benchmark_utils.version import cached_version
+
+
+def test_run_info():
+    """keys for stored results"""
+    info = run_info("1.0")
+    assert info["version"] == "1.0"
+    assert info["host"] == host_fingerprint()
+    assert len(info["host"]) == 12
+    assert info["python"].count(".") == 2
+    assert git_commit("/") is None
+
+
+def test_result_store(tmp_path):
+    """save and load results"""
+    store = ResultStore(tmp_path / "results" / "history.jsonl")
+    assert store.load() == []
+    assert store.latest() == {}
+    store.save({"func": BenchmarkResult([1.0, 2.0], loops=10)}, version="1.0", tag="first")
+    store.save({"func": BenchmarkResult([3.0, 4.0])}, version="1.1")
+    lines = store.path.read_text().splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[0])
+    assert record["func_name"] == "func"
+    assert record["samples"] == [1.0, 2.0]
+    assert record["tag"] == "first"
+    assert len(store.load()) == 2
+    assert len(store.load(version="1.0")) == 1
+    latest = store.latest()
+    assert list(latest["func"]) == [3.0, 4.0]
+    latest = store.latest(version="1.0")
+    assert latest["func"].loops == 10
+
+
+def test_compare_results():
+    """regression, improvement, same and new"""
+    baseline = {
+        "slower": BenchmarkResult([1.0, 1.01, 0.99, 1.02, 0.98]),
+        "faster": BenchmarkResult([1.0, 1.01, 0.99, 1.02, 0.98]),
+        "same": BenchmarkResult([1.0, 1.01, 0.99, 1.02, 0.98]),
+    }
+    results = {
+        "slower": BenchmarkResult([1.2, 1.21, 1.19, 1.22, 1.18]),
+        "faster": BenchmarkResult([0.8, 0.81, 0.79, 0.82, 0.78]),
+        "same": BenchmarkResult([1.0, 1.02, 0.98, 1.01, 0.99]),
+        "new": BenchmarkResult([1.0]),
+    }
+    status = {comparison.func_name: comparison.status for comparison in compare_results(results, baseline)}
+    assert status == {"slower": "regression", "faster": "improvement", "same": "same", "new": "new"}
+    # change less than threshold
+    comparisons = compare_results(results, baseline, threshold=0.5)
+    assert all(comparison.status in ("same", "new") for comparison in comparisons)
+
+
+def test_benchmark_compare_to(tmp_path, capsys):
+    """save and compare Benchmark results"""
+    path = tmp_path / "history.jsonl"
+    bench = benchmark.Benchmark({"func": lambda: sum(range(100))}, num_repeats=5, number=100)
+    bench()
+    bench.save(path, version="1.0")
+    assert bench.compare_to(path, threshold=10) == 0
+    assert bench.compare_to(path, version="1.0", threshold=10) == 0
+    bench.save(path)
+    assert ResultStore(path).load()[-1]["version"] == cached_version()
+    other_host = ResultStore(path).load()[0]
+    other_host.update(host="other", samples=[1e-12] * 5)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(other_host) + "\n")
+    assert bench.compare_to(path, threshold=10) == 0  # other host results not used by default
+    assert bench.compare_to(path, host=None) == 1
+    out = capsys.readouterr().out
+    assert "func" in out
+    assert "same" in out
+
+    slow = benchmark.Benchmark({"func": lambda: sum(range(10000))}, num_repeats=5, number=100)
+    slow()
+    assert slow.compare_to(bench) == 1
+    assert "regression" in capsys.readouterr().out
+    assert bench.compare_to(slow.stats) == 0
@@ -0,0 +1,56 @@
+"""tests for import time - heavy modules imported only when run starts"""
+
+import subprocess
+import sys
+from typing import Set
+
+import pytest
+
+HEAVY = ("rich", "multiprocessing", "asyncio", "concurrent", "timeit", "subprocess", "importlib.metadata", "tomllib")
+
+
+def imported_modules(code: str) -> Set[str]:
+    """Modules imported by code at fresh interpreter, from `-X importtime` report"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True, timeout=60
+    )
+    return {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+
+def heavy(modules: Set[str]) -> Set[str]:
+    return {module for module in modules if module.split(".")[0] in HEAVY or module in HEAVY}
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import benchmark_utils",
+        "from benchmark_utils import Benchmark, BenchmarkIter, BenchmarkResult",
+        "import benchmark_utils.cli",
+    ],
+)
+def test_import_lazy(code: str):
+    """no rich, multiprocessing, asyncio, version lookup at import"""
+    modules = imported_modules(code)
+    assert "benchmark_utils" in modules
+    assert heavy(modules) == set()
+
+
+def test_import_package_only():
+    """package import loads no submodules"""
+    modules = imported_modules("import benchmark_utils")
+    assert {module for module in modules if module.startswith("benchmark_utils.")} == set()
+
+
+def test_lazy_names():
+    """names and version resolved on first access"""
+    code = "import benchmark_utils as bu; print(bu.__version__, bu.Benchmark.__name__, 'Benchmark' in dir(bu))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, timeout=60)
+    version, name, in_dir = result.stdout.split()
+    assert version and version != "UNKNOWN"
+    assert name == "Benchmark"
+    assert in_dir == "True"
+    import benchmark_utils
+
+    with pytest.raises(AttributeError):
+        benchmark_utils.missing  # noqa: B018  # pylint: disable=pointless-statement
@@ -0,0 +1,40 @@
+"""tests for memory measurement"""
+
+import tracemalloc
+
+from benchmark_utils.memory import MemoryResult, current_rss, format_bytes, memory_per_item, trace_memory
+
+
+def allocate(size: int = 1_000_000) -> bytes:
+    """allocate bytes"""
+    return bytes(size)
+
+
+def test_format_bytes():
+    """bytes w/ units"""
+    assert format_bytes(None) == "-"
+    assert format_bytes(100) == "100 B"
+    assert format_bytes(2048) == "2 KiB"
+    assert format_bytes(3 * 1024**2) == "3 MiB"
+    assert format_bytes(5 * 1024**3) == "5 GiB"
+
+
+def test_trace_memory():
+    """peak, net and per item allocations"""
+    kept = []
+    peak, net, rss_delta = trace_memory(lambda: kept.append(allocate()))
+    assert peak >= 1_000_000
+    assert net >= 1_000_000
+    assert rss_delta is None or isinstance(rss_delta, int)
+    peak, net, _ = trace_memory(allocate)
+    assert peak >= 1_000_000
+    assert net < 1_000_000
+    assert not tracemalloc.is_tracing()
+    per_item = memory_per_item(allocate, [1000, 3000])
+    assert 2000 <= per_item < 3000
+    assert memory_per_item(allocate, []) is None
+    assert memory_per_item(allocate, ["wrong"]) < 1000
+    assert current_rss() is None or current_rss() > 0
+    result = MemoryResult(10, 5, None)
+    assert result.column("mem_peak") == 10
+    assert result.column("mem_per_item") is None
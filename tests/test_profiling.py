@@ -0,0 +1,27 @@
+"""tests for profiling"""
+
+from pathlib import Path
+
+from benchmark_utils.profiling import profile_func, profile_path, top_functions
+
+
+def work() -> int:
+    """some work to profile"""
+    return sum(sorted(range(10_000), reverse=True))
+
+
+def test_profile_path():
+    """file name from func name"""
+    assert profile_path("profiles", "func") == Path("profiles/func.pstats")
+    assert profile_path("profiles", "func <lambda>") == Path("profiles/func_lambda.pstats")
+
+
+def test_profile_func(tmp_path: Path):
+    """profile saved, top functions read back"""
+    path = profile_func(work, tmp_path / "sub" / "work.pstats")
+    assert path.exists()
+    entries = top_functions(path, top=2)
+    assert len(entries) == 2
+    assert "work" in entries[0].func
+    assert entries[0].ncalls == 1
+    assert entries[0].cumtime >= entries[0].tottime
@@ -0,0 +1,111 @@
+"""tests for pytest plugin"""
+
+from typing import List
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+TESTS = """
+import pytest
+
+
+def func_sum():
+    sum(range(100))
+
+
+def test_fixture(bench):
+    result = bench(func_sum, num_repeats=3)
+    assert len(result) == 3
+    assert result.loops > 1  # calibrated
+    bench.assert_time(1.0)
+    with pytest.raises(AssertionError, match="max"):
+        bench.assert_time(1e-12, stat="min")
+    bench.assert_baseline(0.1)
+
+
+@pytest.mark.bench_utils(num_repeats=2, target_time=0.01, group="sum")
+def test_marker_options(bench):
+    assert len(bench(func_sum)) == 2
+    result = bench.iter(lambda item: item + 1, [1, 2, 3], name="iter")
+    assert len(result) == 2
+
+
+def test_iter_exceptions(bench):
+    bench.iter(lambda item: 1 / item, [1, 0, 0], num_repeats=2)
+
+
+@pytest.mark.bench_utils
+def test_marked():
+    pass
+
+
+def test_regular():
+    pass
+"""
+
+
+def plugin_args() -> List[str]:
+    """plugin is opt-in, loaded by -p"""
+    return ["-p", "benchmark_utils.pytest_plugin"]
+
+
+def test_plugin(pytester: pytest.Pytester):
+    """fixture, marker options, asserts, summary"""
+    pytester.makepyfile(test_bench=TESTS)
+    result = pytester.runpytest(*plugin_args())
+    result.assert_outcomes(passed=4, failed=1)
+    result.stdout.fnmatch_lines(["*4 exceptions, ZeroDivisionError*", "*benchmarks*", "*test_fixture: median*"])
+    result.stdout.fnmatch_lines(["*test_marker_options[[]iter[]]: median*"])
+    result.stdout.no_fnmatch_line("*test_iter_exceptions: median*")
+
+
+def test_plugin_skip_only(pytester: pytest.Pytester):
+    """skip or run only benchmark tests"""
+    pytester.makepyfile(test_bench=TESTS)
+    result = pytester.runpytest(*plugin_args(), "--bench-skip")
+    result.assert_outcomes(passed=1, skipped=4)
+    result = pytester.runpytest(*plugin_args(), "--bench-only", "-k", "not exceptions")
+    result.assert_outcomes(passed=3, deselected=2)
+    result = pytester.runpytest(*plugin_args(), "--bench-only", "--bench-skip")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_plugin_baseline(pytester: pytest.Pytester):
+    """results saved as baseline, regression against it fails"""
+    pytester.makepyfile(
+        test_bench="""
+from time import sleep
+
+import pytest
+
+
+@pytest.mark.bench_utils(num_repeats=5, autorange=False)
+def test_sleep(bench, request):
+    bench(lambda: sleep(request.config.getoption("--sleep")))
+    bench.assert_baseline(0.2)
+""",
+        conftest="""
+def pytest_addoption(parser):
+    parser.addoption("--sleep", type=float, default=0.002)
+""",
+    )
+    store = str(pytester.path / "bench.jsonl")
+    result = pytester.runpytest(*plugin_args(), "--bench-store", store, "--bench-save")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*results saved*"])
+    result = pytester.runpytest(*plugin_args(), "--bench-store", store, "--sleep", "0.01")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*slower than baseline*", "*regression*"])
+    result = pytester.runpytest(*plugin_args(), "--bench-save")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_plugin_opt_in(pytester: pytest.Pytester):
+    """not loaded w/o -p, benchmark marker name left for pytest-benchmark"""
+    pytester.makepyfile(test_bench="def test_fixture(bench):\n    pass\n")
+    result = pytester.runpytest()
+    result.stdout.fnmatch_lines(["*fixture 'bench' not found*"])
+    result = pytester.runpytest(*plugin_args(), "--markers")
+    result.stdout.fnmatch_lines(["*@pytest.mark.bench_utils*"])
+    result.stdout.no_fnmatch_line("*@pytest.mark.benchmark(*")
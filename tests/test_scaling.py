@@ -0,0 +1,39 @@
+"""tests for scaling"""
+
+import pytest
+
+from benchmark_utils.scaling import default_workers, fit_amdahl, knee_point, scaling_points, scaling_report
+
+
+def amdahl_speedup(serial_fraction: float, num_workers: int) -> float:
+    """ideal speedup by Amdahl law"""
+    return 1 / (serial_fraction + (1 - serial_fraction) / num_workers)
+
+
+def test_scaling_points():
+    """speedup and efficiency"""
+    points = scaling_points([1, 2, 4], [10.0, 20.0, 30.0])
+    assert [point.speedup for point in points] == [1.0, 2.0, 3.0]
+    assert [point.efficiency for point in points] == [1.0, 1.0, 0.75]
+    points = scaling_points([2, 4], [20.0, 40.0])
+    assert points[1].speedup == 4.0
+
+
+def test_fit_amdahl():
+    """serial fraction from speedups"""
+    workers = [1, 2, 4, 8, 16]
+    speedups = [amdahl_speedup(0.1, num_workers) for num_workers in workers]
+    assert fit_amdahl(workers, speedups) == pytest.approx(0.1)
+    assert fit_amdahl(workers, workers) == pytest.approx(0.0)
+    assert fit_amdahl([1], [1.0]) == 0.0
+
+
+def test_knee_point():
+    """knee - adding workers stops paying"""
+    points = scaling_points([1, 2, 4, 8], [10.0, 20.0, 38.0, 40.0])
+    assert knee_point(points) == 4
+    report = scaling_report("func", 100, [1, 2, 4, 8], [10.0, 20.0, 38.0, 40.0])
+    assert report.knee == 4
+    assert 0 < report.serial_fraction < 1
+    assert default_workers(6) == [1, 2, 4, 6]
+    assert default_workers(6, [4, 1, 4]) == [1, 4]
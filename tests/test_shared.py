@@ -0,0 +1,51 @@
+"""tests for shared items"""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from benchmark_utils.shared import SharedItems, SharedRef, shared_item
+
+ITEMS = [b"abc", bytearray(b"de" * 50), memoryview(b"")]
+
+
+@pytest.mark.parametrize("kind", ["shm", "mmap"])
+def test_shared_items(kind: str):
+    """items copied once, views by index, reference pickled"""
+    with SharedItems(ITEMS, kind) as shared:
+        assert len(shared) == 3
+        ref = pickle.loads(pickle.dumps(shared))
+        assert isinstance(ref, SharedRef)
+        assert ref.name == shared.name
+        view = shared_item(ref, 1)
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert bytes(view) == b"de" * 50
+        assert bytes(shared_item(ref, 0)) == b"abc"
+        assert bytes(shared_item(ref, 2)) == b""
+        del view
+        name = shared.name
+    if kind == "mmap":
+        assert not Path(name).exists()
+
+
+def test_shared_items_errors():
+    """wrong kind, not bytes-like items"""
+    with pytest.raises(ValueError):
+        SharedItems(ITEMS, "pipe")
+    with pytest.raises(TypeError):
+        SharedItems([1, 2])
+
+
+def test_shared_numpy():
+    """numpy arrays - array views"""
+    np = pytest.importorskip("numpy")
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    with SharedItems([array, array[:, 1]]) as shared:
+        view = shared_item(shared, 0)
+        assert view.shape == (3, 4)
+        assert view.dtype == np.float32
+        assert (view == array).all()
+        assert (shared_item(shared, 1) == array[:, 1]).all()
+        del view
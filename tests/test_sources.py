@@ -0,0 +1,69 @@
+"""tests for item sources"""
+
+from pathlib import Path
+
+import pytest
+
+from benchmark_utils.sources import DirFiles, FileLines, ItemSource, MmapRecords
+
+
+def gen_items(num: int = 5):
+    """items generator"""
+    yield from range(num)
+
+
+def test_item_source():
+    """sequence, factory, one-shot iterator rejected, length"""
+    source = ItemSource([1, 2, 3])
+    assert source.length == 3
+    assert list(source.iter(2)) == [1, 2]
+    assert list(source) == [1, 2, 3]
+    assert source.count() == 3
+    assert source.count(2) == 2
+    assert source.count(10) == 3
+
+    source = ItemSource(gen_items)
+    assert source.length is None
+    assert list(source) == list(source) == [0, 1, 2, 3, 4]
+    assert list(source.iter(3)) == [0, 1, 2]
+    assert source.count() is None
+    assert source.count(3) == 3
+    assert ItemSource(gen_items, length=5).count(10) == 5
+
+    with pytest.raises(TypeError, match="factory"):
+        ItemSource(gen_items(3))
+    with pytest.raises(TypeError):
+        ItemSource(iter([1, 2]))
+
+
+def test_file_lines(tmp_path: Path):
+    """lines read lazily, file reopened"""
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nb\nc\n")
+    lines = FileLines(path)
+    assert list(lines) == ["a", "b", "c"]
+    assert list(ItemSource(lines).iter(2)) == ["a", "b"]
+    assert ItemSource(lines).length is None
+
+
+def test_dir_files(tmp_path: Path):
+    """files matched by pattern"""
+    (tmp_path / "sub").mkdir()
+    for name in ("a.txt", "b.csv", "sub/c.txt"):
+        (tmp_path / name).write_text(name)
+    assert sorted(path.name for path in DirFiles(tmp_path, "*.txt")) == ["a.txt", "c.txt"]
+    assert len(list(DirFiles(tmp_path))) == 3
+
+
+def test_mmap_records(tmp_path: Path):
+    """fixed size records"""
+    path = tmp_path / "records.bin"
+    path.write_bytes(b"aaaabbbbcc")
+    records = MmapRecords(path, 4)
+    assert len(records) == 2
+    assert list(records) == [b"aaaa", b"bbbb"]
+    assert ItemSource(records).length == 2
+    path.write_bytes(b"")
+    assert list(records) == []
+    with pytest.raises(ValueError):
+        MmapRecords(path, 0)
@@ -0,0 +1,85 @@
+"""tests for stats"""
+
+import math
+import statistics
+
+import pytest
+
+from benchmark_utils.stats import BenchmarkResult, percentile, t_quantile
+
+
+def test_percentile():
+    """percentile w/ linear interpolation"""
+    data = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(data, 0) == 1.0
+    assert percentile(data, 100) == 4.0
+    assert percentile(data, 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_benchmark_result():
+    """statistics on samples"""
+    samples = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 100.0]
+    result = BenchmarkResult(samples, loops=10)
+    assert len(result) == 10
+    assert list(result) == samples
+    assert result[0] == 1.0
+    assert result.samples.typecode == "d"
+    assert result.loops == 10
+    assert result.mean == pytest.approx(statistics.mean(samples))
+    assert result.min == 1.0
+    assert result.max == 100.0
+    assert result.median == 5.5
+    assert result.stdev == pytest.approx(statistics.stdev(samples))
+    assert result.iqr == pytest.approx(7.75 - 3.25)
+    assert result.p95 > result.percentile(90)
+    assert result.p99 > result.p95
+    assert result.outliers_tukey() == 1
+    assert result.outliers_mad() == 1
+    ci_low, ci_high = result.ci()
+    assert ci_low < result.mean < ci_high
+    assert result.ci() == result.ci()  # seeded
+    summary = result.summary()
+    assert summary["median"] == 5.5
+    assert summary["num_samples"] == 10
+    assert "BenchmarkResult" in repr(result)
+
+    result = BenchmarkResult([2.0])
+    assert result.stdev == 0.0
+    assert result.ci() == (2.0, 2.0)
+    result.append(2.0)
+    assert len(result) == 2
+    assert result.outliers_mad() == 0
+
+
+def test_relative_ci_width():
+    """relative width of ci for mean"""
+    assert BenchmarkResult([1.0]).relative_ci_width() == math.inf
+    assert BenchmarkResult([1.0, 1.0, 1.0]).relative_ci_width() == 0.0
+    assert BenchmarkResult([0.0, 0.0]).relative_ci_width() == 0.0
+    result = BenchmarkResult([0.9, 1.0, 1.1] * 10)
+    width = result.relative_ci_width()
+    assert width == pytest.approx(2 * 2.045 * result.stdev / math.sqrt(30), rel=0.01)
+    assert result.relative_ci_width(0.99) > width
+    assert t_quantile(0.95, 1000) == pytest.approx(1.96, abs=0.01)
+
+
+def test_t_quantile():
+    """known two-sided Student t quantiles, small df exact"""
+    known = {
+        (0.95, 1): 12.706,
+        (0.95, 2): 4.303,
+        (0.95, 3): 3.182,
+        (0.95, 4): 2.776,
+        (0.95, 10): 2.228,
+        (0.95, 30): 2.042,
+        (0.95, 60): 2.000,
+        (0.99, 1): 63.657,
+        (0.99, 5): 4.032,
+        (0.90, 2): 2.920,
+        (0.90, 29): 1.699,
+    }
+    for (confidence, df), value in known.items():
+        assert t_quantile(confidence, df) == pytest.approx(value, abs=1e-3)
@@ -0,0 +1,43 @@
+"""tests for trace recording and export"""
+
+import json
+import os
+from pathlib import Path
+
+from benchmark_utils.trace import TraceEvent, TraceRecorder
+
+
+def test_trace_recorder(tmp_path: Path):
+    """events, merge, Chrome trace-event export"""
+    trace = TraceRecorder()
+    pid = os.getpid()
+    trace.add("func", "repeat", 1_000_000, 5_000_000, pid, 1, {"items": 2})
+    trace.add("func", "item", 1_000_000, 2_000_000, pid, 1, {"index": 0})
+    assert len(trace) == 2
+    assert trace.events[0] == TraceEvent("func", "repeat", 1_000_000, 5_000_000, pid, 1, {"items": 2})
+    assert trace.count("item") == 1
+
+    worker = TraceRecorder()
+    worker.process_names.clear()
+    worker.add("func", "item", 2_500_000, 4_000_000, 123, 7)
+    worker.name_thread(123, 7, "main")
+    worker.overhead_ns = 10
+    trace.merge(worker)
+    assert len(trace) == 3
+    assert trace.overhead_ns == 10
+
+    data = trace.to_chrome()
+    assert data["otherData"]["recording_overhead_ns"] == 10
+    meta = [event for event in data["traceEvents"] if event["ph"] == "M"]
+    assert {event["args"]["name"] for event in meta} == {"benchmark", "worker 123", "main"}
+    events = [event for event in data["traceEvents"] if event["ph"] == "X"]
+    assert [event["cat"] for event in events] == ["repeat", "item", "item"]  # outer event first on same start
+    assert events[0]["ts"] == 0
+    assert events[0]["dur"] == 4000
+    assert events[2]["ts"] == 1500
+    assert events[2]["pid"] == 123
+    assert "args" not in events[2]
+
+    path = trace.save(tmp_path / "traces" / "run.json")
+    assert json.loads(path.read_text()) == data
+    assert TraceRecorder().to_chrome()["traceEvents"] == []